@@ -13,12 +13,21 @@ from datetime import datetime
 import json
 import os
 
+try:
+    import winsound  # Windows only
+except ImportError:
+    winsound = None
+
 
 class TelegramAlerter:
     """Handles Telegram alerts for crossover detection"""
 
+    BATCH_WINDOW = 0.05  # Alerts queued this close together go out as one message
+    MAX_MESSAGE_LENGTH = 4096  # Telegram's limit for one sendMessage text
+
     def __init__(self, config_manager):
         self.config = config_manager
+        self.session = requests.Session()  # Worker thread only; keeps the HTTPS connection alive between alerts
         self.alert_queue = queue.Queue()
         self.last_alert_time = 0
         self.failed_alerts = []
@@ -43,34 +52,66 @@ class TelegramAlerter:
 
     def _worker_loop(self):
         """Background worker loop for processing alert queue"""
+        carry = None  # Alert that did not fit in the previous batch
         while self.running:
             try:
                 # Get alert from queue with timeout
-                alert_data = self.alert_queue.get(timeout=1)
-
-                # Send alert
-                success = self._send_telegram_message(
-                    alert_data['message'],
-                    alert_data.get('parse_mode', 'HTML')
-                )
-
-                if success:
-                    self.last_alert_time = time.time()
-                    logging.info("Alert sent successfully")
-                else:
-                    self.failed_alerts.append({
-                        'timestamp': time.time(),
-                        'message': alert_data['message'],
-                        'error': 'Send failed'
-                    })
-
-                self.alert_queue.task_done()
+                alert_data = carry or self.alert_queue.get(timeout=1)
+                carry = None
+
+                # Fold alerts arriving right behind it into the same message
+                batch = [alert_data]
+                length = len(alert_data['message'])
+                while True:
+                    try:
+                        extra = self.alert_queue.get(timeout=self.BATCH_WINDOW)
+                    except queue.Empty:
+                        break
+                    if (extra.get('parse_mode', 'HTML') != alert_data.get('parse_mode', 'HTML') or
+                            length + 2 + len(extra['message']) > self.MAX_MESSAGE_LENGTH):
+                        carry = extra
+                        break
+                    batch.append(extra)
+                    length += 2 + len(extra['message'])
+
+                self._send_batch(batch)
 
             except queue.Empty:
                 continue
             except Exception as e:
                 logging.error(f"Alert worker error: {e}")
 
+        # An alert held back from the last batch was already taken off the
+        # queue; send it rather than lose it
+        if carry is not None:
+            try:
+                self._send_batch([carry])
+            except Exception as e:
+                logging.error(f"Alert worker error: {e}")
+
+    def _send_batch(self, batch):
+        """Send queued alerts as one message and mark them done"""
+        message = "\n\n".join(alert['message'] for alert in batch)
+
+        # Send alert
+        success = self._send_telegram_message(
+            message,
+            batch[0].get('parse_mode', 'HTML')
+        )
+
+        if success:
+            self.last_alert_time = time.time()
+            logging.info(f"Alert sent successfully ({len(batch)} in batch)")
+        else:
+            self.failed_alerts.append({
+                'timestamp': time.time(),
+                'message': message,
+                'error': 'Send failed'
+            })
+
+        for _ in batch:
+            self.alert_queue.task_done()
+
     def test_connection(self) -> tuple[bool, str]:
         """Test Telegram bot connection"""
         try:
@@ -110,7 +151,10 @@ class TelegramAlerter:
 
             test_message = "🔧 ZigZag Detector Test Message\n\nIf you see this, alerts are working correctly!"
 
-            success = self._send_telegram_message(test_message)
+            # The worker thread owns self.session, and sessions are not
+            # thread-safe; the test gets its own
+            with requests.Session() as session:
+                success = self._send_telegram_message(test_message, session=session)
 
             if success:
                 return True, "Test message sent successfully"
@@ -151,8 +195,9 @@ class TelegramAlerter:
             logging.error(f"Failed to queue alert: {e}")
             return False
 
-    def _send_telegram_message(self, message: str, parse_mode: str = 'HTML') -> bool:
-        """Send message via Telegram API"""
+    def _send_telegram_message(self, message: str, parse_mode: str = 'HTML',
+                               session: Optional[requests.Session] = None) -> bool:
+        """Send message via Telegram API, on the worker's session unless one is given"""
         try:
             token = self.config.get('alerts', 'telegram_token', '')
             chat_id = self.config.get('alerts', 'telegram_chat_id', '')
@@ -169,7 +214,7 @@ class TelegramAlerter:
                 'disable_web_page_preview': True
             }
 
-            response = requests.post(url, data=data, timeout=15)
+            response = (session or self.session).post(url, data=data, timeout=15)
 
             if response.status_code == 200:
                 result = response.json()
@@ -369,17 +414,14 @@ class AlertManager:
     def _play_alert_sound(self) -> bool:
         """Play alert sound"""
         try:
+            if winsound is None:
+                # Fallback for non-Windows systems
+                print('\a')  # Terminal bell
+                return True
+
             # Try to play system beep
-            import winsound
             winsound.Beep(1000, 500)  # 1000 Hz for 500ms
             return True
-        except ImportError:
-            # Fallback for non-Windows systems
-            try:
-                print('\a')  # Terminal bell
-                return True
-            except:
-                return False
         except Exception as e:
             logging.error(f"Sound alert failed: {e}")
             return False
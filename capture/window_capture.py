@@ -3,6 +3,7 @@ Window capture module for ZigZag Detector
 Handles window detection and screen capture
 """
 
+import sys
 import cv2
 import numpy as np
 import mss
@@ -12,6 +13,15 @@ import logging
 from typing import Optional, Dict, List, Tuple
 from dataclasses import dataclass
 
+try:
+    import dxcam  # DXGI Desktop Duplication, Windows 8+
+    DXCAM_AVAILABLE = True
+except ImportError:
+    DXCAM_AVAILABLE = False
+
+# Capture runs once per frame, so its failures share the throttled logger
+frame_log = logging.getLogger('zigzag.frame')
+
 
 @dataclass
 class WindowInfo:
@@ -34,11 +44,69 @@ class WindowInfo:
 class WindowCapture:
     """Handles window detection and screen capture"""
 
-    def __init__(self):
+    def __init__(self, fast_capture=True):
         self.sct = mss.mss()
+        self.camera = None
+        self.fast_capture = False
+        self.last_duplicated = (None, None)  # (region, frame) of the newest Desktop Duplication grab
+        self.set_fast_capture(fast_capture)
         self.target_window = None
         self.custom_region = None
 
+    def set_fast_capture(self, enabled, explicit=False):
+        """Use Desktop Duplication when enabled and available, mss otherwise
+
+        explicit marks a user's own request, the only case where a missing
+        dxcam is worth a warning rather than a note.
+        """
+        if enabled and self.camera is None:
+            self.camera = self._create_camera(explicit)
+        self.fast_capture = enabled and self.camera is not None
+        # A frame kept from before the switch may no longer match the desktop
+        self.last_duplicated = (None, None)
+        logging.info(f"Capture backend: {'Desktop Duplication' if self.fast_capture else 'mss'}")
+
+    @staticmethod
+    def _create_camera(explicit=False):
+        """Open a Desktop Duplication camera on the primary monitor, if available"""
+        if not DXCAM_AVAILABLE:
+            if sys.platform == 'win32':
+                # Desktop composition is always on from Windows 8, and mss
+                # grabs through GDI are several times slower under it
+                log = logging.warning if explicit else logging.info
+                log("Fast capture needs dxcam (pip install dxcam); "
+                    "falling back to mss, which is slow with desktop composition")
+            return None
+        try:
+            return dxcam.create(output_color="BGR")
+        except Exception as e:
+            logging.error(f"Desktop Duplication unavailable, using mss: {e}")
+            return None
+
+    def _grab_duplicated(self, region=None) -> Optional[np.ndarray]:
+        """Grab a BGR region, or the whole primary monitor, through Desktop Duplication
+
+        dxcam returns nothing while the desktop is unchanged, so the previous
+        frame of the same region is handed out again; the array is kept for
+        that and must not be written to. Returns None only when the region is
+        off the primary monitor or nothing was grabbed yet, and the caller
+        falls back to mss.
+        """
+        if region is not None:
+            left, top = region['left'], region['top']
+            right, bottom = left + region['width'], top + region['height']
+            if left < 0 or top < 0 or right > self.camera.width or bottom > self.camera.height:
+                return None
+            region = (left, top, right, bottom)
+
+        frame = self.camera.grab(region=region)
+        if frame is not None:
+            self.last_duplicated = (region, frame)
+            return frame
+
+        last_region, last_frame = self.last_duplicated
+        return last_frame if last_region == region else None
+
     def find_windows(self, keywords: List[str] = None) -> List[WindowInfo]:
         """Find all windows matching keywords"""
         if keywords is None:
@@ -81,6 +149,20 @@ class WindowCapture:
         logging.warning("No suitable windows found for auto-detection")
         return None
 
+    def grab_primary_duplicated(self) -> Optional[np.ndarray]:
+        """Grab the whole primary monitor as BGR through Desktop Duplication
+
+        Returns None without Desktop Duplication, or when no frame of the whole
+        monitor is available yet.
+        """
+        if not self.fast_capture:
+            return None
+        try:
+            return self._grab_duplicated()
+        except Exception as e:
+            frame_log.error(f"Desktop Duplication grab failed: {e}")
+            return None
+
     def set_target_window(self, window_info: WindowInfo):
         """Set target window for capture"""
         self.target_window = window_info
@@ -93,8 +175,13 @@ class WindowCapture:
         self.target_window = None  # Clear window selection
         logging.info(f"Custom region set: {region}")
 
-    def capture_screen(self) -> Optional[np.ndarray]:
-        """Capture screen region"""
+    def capture_screen(self, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Capture screen region
+
+        If out is a uint8 BGR array matching the region size the frame is written
+        into it; otherwise a new array is allocated. Callers can pass the previous
+        result back in to reuse one buffer across frames.
+        """
         try:
             # Determine region to capture
             if self.custom_region:
@@ -110,29 +197,42 @@ class WindowCapture:
                         'height': rect[3] - rect[1]
                     }
                 except:
-                    logging.error("Target window no longer exists")
+                    frame_log.error("Target window no longer exists")
                     return None
             else:
-                logging.error("No capture region defined")
+                frame_log.error("No capture region defined")
                 return None
 
             # Validate region
             if region['width'] <= 0 or region['height'] <= 0:
-                logging.error(f"Invalid capture region: {region}")
+                frame_log.error(f"Invalid capture region: {region}")
                 return None
 
-            # Capture screenshot
+            # Desktop Duplication maps the GPU frame once and hands back BGR
+            if self.fast_capture:
+                frame = self._grab_duplicated(region)
+                if frame is not None:
+                    # The frame may be handed out again for an unchanged
+                    # desktop, so the caller always gets its own array
+                    if out is None or out.shape != frame.shape or out.dtype != frame.dtype:
+                        return frame.copy()
+                    np.copyto(out, frame)
+                    return out
+
+            # Capture screenshot and view the raw BGRA bytes without copying
             screenshot = self.sct.grab(region)
-            img = np.array(screenshot)
+            bgra = np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(
+                screenshot.height, screenshot.width, 4)
 
-            # Convert BGRA to BGR
-            if img.shape[2] == 4:
-                img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+            # Reuse the caller's buffer when it still matches the region size
+            if out is None or out.shape != (screenshot.height, screenshot.width, 3) or out.dtype != np.uint8:
+                out = None
 
-            return img
+            # Convert BGRA to BGR
+            return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=out)
 
         except Exception as e:
-            logging.error(f"Screen capture failed: {e}")
+            frame_log.error(f"Screen capture failed: {e}")
             return None
 
     def get_capture_info(self) -> Dict:
@@ -5,9 +5,11 @@ Handles all settings, defaults, and persistence
 
 import json
 import os
+import time
 import logging
 from pathlib import Path
 from typing import Dict, Any
+from dataclasses import dataclass
 
 # Default configuration
 DEFAULT_CONFIG = {
@@ -20,7 +22,8 @@ DEFAULT_CONFIG = {
     'capture': {
         'fps': 2,
         'image_scale': 1.0,
-        'save_screenshots': False
+        'save_screenshots': False,
+        'fast_capture': True  # Desktop Duplication through dxcam when installed (Windows)
     },
 
     'colors': {
@@ -45,7 +48,8 @@ DEFAULT_CONFIG = {
         'confidence_threshold': 0.7,
         'intersection_tolerance': 8,
         'temporal_validation_frames': 2,
-        'debounce_seconds': 60
+        'debounce_seconds': 60,
+        'downscale': 1  # Detect on a frame shrunk by this factor (1 = full size)
     },
 
     'alerts': {
@@ -62,11 +66,25 @@ DEFAULT_CONFIG = {
         'theme': 'default',
         'always_on_top': False,
         'minimize_to_tray': True,
-        'auto_start_detection': False
+        'auto_start_detection': False,
+        'preview_color': True  # False shows a grayscale preview while nothing is drawn on it
     }
 }
 
 
+@dataclass
+class DetectionSettings:
+    """Snapshot of detection settings, retaken only when settings change"""
+    MAX_DOWNSCALE = 3  # 2px lines can drop out at 4x depending on grid alignment
+
+    min_line_length: int = 30
+    confidence_threshold: float = 0.7
+    intersection_tolerance: int = 8
+    debounce_seconds: float = 60
+    downscale: int = 1
+    colors: tuple = ()  # (line_name, color_config copy) for each enabled line
+
+
 class ConfigManager:
     """Manages application configuration"""
 
@@ -89,14 +107,22 @@ class ConfigManager:
             logging.error(f"Failed to load config: {e}")
             logging.info("Using default configuration")
 
-    def save_config(self):
-        """Save configuration to file"""
+    def save_config(self, data=None):
+        """Save configuration to file
+
+        data is a snapshot of the config to write instead of the live dict,
+        for saving from another thread.
+        """
         try:
             # Create directory if it doesn't exist
             self.config_file.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            # Write beside the file and swap it in, so a crash mid-write
+            # never leaves a truncated config behind
+            temp_file = self.config_file.with_suffix('.json.tmp')
+            with open(temp_file, 'w') as f:
+                json.dump(self.config if data is None else data, f, indent=2)
+            os.replace(temp_file, self.config_file)
             logging.info(f"Configuration saved to {self.config_file}")
             return True
         except Exception as e:
@@ -131,6 +157,26 @@ class ConfigManager:
             self.config[section] = {}
         self.config[section][key] = value
 
+    def update_section(self, section, values):
+        """Set several values of one section in a single update"""
+        self.config.setdefault(section, {}).update(values)
+
+    def detection_settings(self) -> DetectionSettings:
+        """Read the detection section into a DetectionSettings snapshot"""
+        detection = self.config.get('detection', {})
+        defaults = DetectionSettings()
+        return DetectionSettings(
+            min_line_length=detection.get('min_line_length', defaults.min_line_length),
+            confidence_threshold=detection.get('confidence_threshold', defaults.confidence_threshold),
+            intersection_tolerance=detection.get('intersection_tolerance', defaults.intersection_tolerance),
+            debounce_seconds=detection.get('debounce_seconds', defaults.debounce_seconds),
+            downscale=min(max(int(detection.get('downscale', defaults.downscale)), 1),
+                          DetectionSettings.MAX_DOWNSCALE),
+            colors=tuple((line_name, dict(color_config))
+                         for line_name, color_config in self.config.get('colors', {}).items()
+                         if color_config.get('enabled', True))
+        )
+
     def get_color_config(self, line_name):
         """Get color configuration for a specific line"""
         return self.config['colors'].get(line_name, {})
@@ -170,6 +216,37 @@ class ConfigManager:
         return errors
 
 
+class RepeatFilter(logging.Filter):
+    """Drops warnings and errors repeated from one call site within an interval
+
+    Attached to the zigzag.frame logger, so a failure in a per-frame path
+    cannot flood the log at the frame rate. The next message let through notes how many were suppressed.
+    """
+
+    def __init__(self, interval=1.0):
+        super().__init__()
+        self.interval = interval
+        self.last_logged = {}
+        self.suppressed = {}
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING:
+            return True
+
+        site = (record.pathname, record.lineno)
+        now = time.monotonic()
+        last = self.last_logged.get(site)
+        if last is not None and now - last < self.interval:
+            self.suppressed[site] = self.suppressed.get(site, 0) + 1
+            return False
+
+        self.last_logged[site] = now
+        count = self.suppressed.pop(site, 0)
+        if count:
+            record.msg = f"{record.msg} ({count} similar suppressed)"
+        return True
+
+
 def setup_logging():
     """Setup logging configuration"""
     # Create logs directory
@@ -186,6 +263,10 @@ def setup_logging():
         ]
     )
 
+    # Throttle repeated errors from the per-frame capture and detection
+    # code only; everything else logs every message
+    logging.getLogger('zigzag.frame').addFilter(RepeatFilter())
+
     # Reduce noise from some libraries
     logging.getLogger('PIL').setLevel(logging.WARNING)
     logging.getLogger('urllib3').setLevel(logging.WARNING)
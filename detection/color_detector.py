@@ -9,6 +9,27 @@ import logging
 from typing import List, Tuple, Dict, Optional
 from dataclasses import dataclass
 import time
+from .kernels import NUMBA_AVAILABLE, classify_hsv, mask_line_hits
+
+# Per-frame failures; repeats are throttled by setup_logging
+frame_log = logging.getLogger('zigzag.frame')
+
+# HSV range keys in channel order
+HSV_RANGE_KEYS = (('hue_min', 'hue_max'), ('sat_min', 'sat_max'), ('val_min', 'val_max'))
+
+# Colors packed into one uint8 lookup table entry
+MAX_LUT_COLORS = 8
+
+# Colors classified per pass by the compiled kernel
+MAX_KERNEL_COLORS = 32
+
+MORPH_KERNEL = np.ones((3, 3), np.uint8)
+
+# Color mapping for visualization
+LINE_COLORS = {
+    'zigzag_line1': (0, 255, 255),  # Yellow
+    'zigzag_line2': (255, 0, 255),  # Magenta
+}
 
 
 @dataclass
@@ -18,16 +39,13 @@ class DetectedLine:
     color_name: str
     confidence: float
     timestamp: float
-    length: float
+    length: float = 0.0
 
     def __post_init__(self):
         """Calculate line length after initialization"""
         if len(self.points) > 1:
-            total_length = 0
-            for i in range(len(self.points) - 1):
-                p1, p2 = self.points[i], self.points[i + 1]
-                total_length += np.sqrt((p2[0] - p1[0]) ** 2 + (p2[1] - p1[1]) ** 2)
-            self.length = total_length
+            steps = np.diff(np.asarray(self.points, dtype=np.float64), axis=0)
+            self.length = float(np.hypot(steps[:, 0], steps[:, 1]).sum())
         else:
             self.length = 0
 
@@ -40,6 +58,14 @@ class ColorDetector:
         self.debug_mode = False
         self.last_detection_time = 0
 
+        # Per-channel HSV lookup table, rebuilt when the color ranges change
+        self._lut_key = None
+        self._hsv_lut = None
+
+        # Reused destinations for downscaled frames and their HSV conversion
+        self._small_buf = None
+        self._hsv_buf = None
+
     def set_debug_mode(self, enabled: bool):
         """Enable/disable debug mode for visualization"""
         self.debug_mode = enabled
@@ -65,17 +91,101 @@ class ColorDetector:
             # Create mask
             mask = cv2.inRange(hsv, lower, upper)
 
-            # Apply morphological operations to clean up the mask
-            kernel = np.ones((3, 3), np.uint8)
-            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-            mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
-
-            return mask
+            return self.clean_mask(mask)
 
         except Exception as e:
-            logging.error(f"Failed to create color mask: {e}")
+            frame_log.error(f"Failed to create color mask: {e}")
             return np.zeros(image.shape[:2], dtype=np.uint8)
 
+    @staticmethod
+    def clean_mask(mask: np.ndarray, open_mask: bool = True) -> np.ndarray:
+        """Apply morphological operations to clean up a binary mask
+
+        The opening removes specks but also anything under 3 pixels wide, so
+        it is skipped on downscaled masks where chart lines are that thin.
+        """
+        if open_mask:
+            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, MORPH_KERNEL)
+        return cv2.morphologyEx(mask, cv2.MORPH_CLOSE, MORPH_KERNEL)
+
+    def downscale(self, image: np.ndarray, scale: int) -> np.ndarray:
+        """Shrink image by an integer factor into a buffer reused across frames"""
+        height, width = image.shape[0] // scale, image.shape[1] // scale
+        if self._small_buf is None or self._small_buf.shape != (height, width) + image.shape[2:]:
+            self._small_buf = None
+
+        self._small_buf = cv2.resize(image, (width, height), dst=self._small_buf,
+                                     interpolation=cv2.INTER_AREA)
+        return self._small_buf
+
+    def to_hsv(self, image: np.ndarray) -> np.ndarray:
+        """Convert a BGR image to HSV into a buffer reused across frames"""
+        if self._hsv_buf is None or self._hsv_buf.shape != image.shape:
+            self._hsv_buf = None
+
+        self._hsv_buf = cv2.cvtColor(image, cv2.COLOR_BGR2HSV, dst=self._hsv_buf)
+        return self._hsv_buf
+
+    def build_hsv_lut(self, color_configs: List[Dict]) -> np.ndarray:
+        """Build a per-channel lookup table mapping HSV bytes to color bitmasks
+
+        Bit i of lut[value, 0, channel] is set when value lies inside the range
+        of color i on that channel, so ANDing the three looked-up channels gives
+        the set of colors matching a pixel.
+        """
+        values = np.arange(256)
+        lut = np.zeros((256, 1, 3), dtype=np.uint8)
+
+        for bit, color_config in enumerate(color_configs[:MAX_LUT_COLORS]):
+            for channel, (min_key, max_key) in enumerate(HSV_RANGE_KEYS):
+                in_range = (values >= color_config[min_key]) & (values <= color_config[max_key])
+                lut[in_range, 0, channel] |= np.uint8(1 << bit)
+
+        return lut
+
+    def create_color_masks(self, hsv: np.ndarray, color_configs: List[Dict],
+                           scale: int = 1) -> List[np.ndarray]:
+        """Create cleaned binary masks for several colors from one HSV image shrunk by scale"""
+        try:
+            # Rebuild the lookup table only when a color range changes
+            lut_key = tuple(tuple(color_config[key] for pair in HSV_RANGE_KEYS for key in pair)
+                            for color_config in color_configs[:MAX_LUT_COLORS])
+            if lut_key != self._lut_key:
+                self._hsv_lut = self.build_hsv_lut(color_configs)
+                self._lut_key = lut_key
+
+            # One table lookup classifies every pixel against all colors
+            bits = cv2.LUT(hsv, self._hsv_lut)
+            combined = np.bitwise_and(bits[..., 0], bits[..., 1])
+            np.bitwise_and(combined, bits[..., 2], out=combined)
+
+            # Colors past the table are classified in one kernel pass when available
+            extra_configs = color_configs[MAX_LUT_COLORS:]
+            extra_bits = None
+            if NUMBA_AVAILABLE and 0 < len(extra_configs) <= MAX_KERNEL_COLORS:
+                bounds = np.array([[color_config[key] for pair in HSV_RANGE_KEYS for key in pair]
+                                   for color_config in extra_configs], dtype=np.int32)
+                extra_bits = classify_hsv(hsv, bounds)
+
+            masks = []
+            for bit, color_config in enumerate(color_configs):
+                if bit < MAX_LUT_COLORS:
+                    mask = cv2.compare(np.bitwise_and(combined, np.uint8(1 << bit)), 0, cv2.CMP_NE)
+                elif extra_bits is not None:
+                    flag = np.uint32(1 << (bit - MAX_LUT_COLORS))
+                    mask = np.where(extra_bits & flag, np.uint8(255), np.uint8(0))
+                else:
+                    lower = np.array([color_config[min_key] for min_key, _ in HSV_RANGE_KEYS])
+                    upper = np.array([color_config[max_key] for _, max_key in HSV_RANGE_KEYS])
+                    mask = cv2.inRange(hsv, lower, upper)
+                masks.append(self.clean_mask(mask, open_mask=scale == 1))
+
+            return masks
+
+        except Exception as e:
+            frame_log.error(f"Failed to create color masks: {e}")
+            return [np.zeros(hsv.shape[:2], dtype=np.uint8) for _ in color_configs]
+
     def extract_line_points(self, mask: np.ndarray, min_length: int = 30) -> List[Tuple[int, int]]:
         """Extract ordered points from line mask"""
         try:
@@ -110,11 +220,15 @@ class ColorDetector:
             return unique_points
 
         except Exception as e:
-            logging.error(f"Failed to extract line points: {e}")
+            frame_log.error(f"Failed to extract line points: {e}")
             return []
 
-    def calculate_line_confidence(self, points: List[Tuple[int, int]], mask: np.ndarray) -> float:
-        """Calculate confidence score for detected line"""
+    def calculate_line_confidence(self, points: List[Tuple[int, int]], mask: np.ndarray,
+                                  scale: int = 1) -> float:
+        """Calculate confidence score for detected line
+
+        points are in full image coordinates; mask may be downscaled by scale.
+        """
         try:
             if len(points) < 2:
                 return 0.0
@@ -133,22 +247,10 @@ class ColorDetector:
             points_factor = min(num_points / 20.0, 1.0)  # Normalize to 20 points
 
             # Check mask density along the line
-            mask_hits = 0
-            total_checks = 0
-
-            for i in range(len(points) - 1):
-                p1, p2 = points[i], points[i + 1]
-                # Sample points along the line segment
-                steps = max(int(np.sqrt((p2[0] - p1[0]) ** 2 + (p2[1] - p1[1]) ** 2) / 5), 1)
-                for j in range(steps):
-                    t = j / steps
-                    x = int(p1[0] + t * (p2[0] - p1[0]))
-                    y = int(p1[1] + t * (p2[1] - p1[1]))
-
-                    if 0 <= y < mask.shape[0] and 0 <= x < mask.shape[1]:
-                        total_checks += 1
-                        if mask[y, x] > 0:
-                            mask_hits += 1
+            if NUMBA_AVAILABLE:
+                mask_hits, total_checks = mask_line_hits(np.asarray(points, dtype=np.int64), mask, scale)
+            else:
+                mask_hits, total_checks = self._mask_line_hits(points, mask, scale)
 
             mask_factor = mask_hits / max(total_checks, 1)
 
@@ -158,31 +260,73 @@ class ColorDetector:
             return min(max(confidence, 0.0), 1.0)
 
         except Exception as e:
-            logging.error(f"Failed to calculate confidence: {e}")
+            frame_log.error(f"Failed to calculate confidence: {e}")
             return 0.0
 
-    def detect_lines(self, image: np.ndarray) -> List[DetectedLine]:
-        """Detect all configured ZigZag lines in image"""
+    @staticmethod
+    def _mask_line_hits(points: List[Tuple[int, int]], mask: np.ndarray, scale: int) -> Tuple[int, int]:
+        """Sample mask every 5 pixels along a polyline in Python, returning (hits, checks)"""
+        mask_hits = 0
+        total_checks = 0
+
+        for i in range(len(points) - 1):
+            p1, p2 = points[i], points[i + 1]
+            # Sample points along the line segment
+            steps = max(int(np.sqrt((p2[0] - p1[0]) ** 2 + (p2[1] - p1[1]) ** 2) / 5), 1)
+            for j in range(steps):
+                t = j / steps
+                x = int(p1[0] + t * (p2[0] - p1[0])) // scale
+                y = int(p1[1] + t * (p2[1] - p1[1])) // scale
+
+                if 0 <= y < mask.shape[0] and 0 <= x < mask.shape[1]:
+                    total_checks += 1
+                    if mask[y, x] > 0:
+                        mask_hits += 1
+
+        return mask_hits, total_checks
+
+    def detect_lines(self, image: np.ndarray, settings=None) -> List[DetectedLine]:
+        """Detect all configured ZigZag lines in image
+
+        settings is a DetectionSettings snapshot; it is read from the config
+        when not given.
+        """
         detected_lines = []
         current_time = time.time()
 
         try:
-            min_length = self.config.get('detection', 'min_line_length', 30)
+            if settings is None:
+                settings = self.config.detection_settings()
+            min_length = settings.min_line_length
+
+            # Optionally detect on a shrunken frame; min_length is a contour area
+            scale = settings.downscale
+            if scale > 1:
+                image = self.downscale(image, scale)
+                min_length = min_length / (scale * scale)
+
+            # Enabled colors come pre-collected in the settings snapshot
+            enabled_colors = settings.colors
+            if not enabled_colors:
+                self.last_detection_time = current_time
+                return detected_lines
+
+            # Convert to HSV once and mask all colors in a single lookup pass
+            hsv = self.to_hsv(image)
+            masks = self.create_color_masks(hsv, [color_config for _, color_config in enabled_colors], scale)
 
             # Process each configured color
-            for line_name, color_config in self.config.config['colors'].items():
-                if not color_config.get('enabled', True):
-                    continue
-
-                # Create color mask
-                mask = self.create_color_mask(image, color_config)
-
+            for (line_name, color_config), mask in zip(enabled_colors, masks):
                 # Extract line points
                 points = self.extract_line_points(mask, min_length)
 
                 if points:
+                    # Map points back to capture coordinates
+                    if scale > 1:
+                        points = [(x * scale, y * scale) for x, y in points]
+
                     # Calculate confidence
-                    confidence = self.calculate_line_confidence(points, mask)
+                    confidence = self.calculate_line_confidence(points, mask, scale)
 
                     # Create detected line object
                     line = DetectedLine(
@@ -198,43 +342,45 @@ class ColorDetector:
                                   f"confidence: {confidence:.2f}, length: {line.length:.1f}")
 
         except Exception as e:
-            logging.error(f"Line detection failed: {e}")
+            frame_log.error(f"Line detection failed: {e}")
 
         self.last_detection_time = current_time
         return detected_lines
 
-    def visualize_detection(self, image: np.ndarray, lines: List[DetectedLine]) -> np.ndarray:
-        """Create visualization of detected lines"""
+    @staticmethod
+    def visualize_detection(image: np.ndarray, lines: List[DetectedLine],
+                            inplace: bool = False) -> np.ndarray:
+        """Create visualization of detected lines, or draw onto image itself when inplace"""
         try:
-            vis_image = image.copy()
-
-            # Color mapping for visualization
-            color_map = {
-                'zigzag_line1': (0, 255, 255),  # Yellow
-                'zigzag_line2': (255, 0, 255),  # Magenta
-            }
+            vis_image = image if inplace else image.copy()
 
             for line in lines:
-                color = color_map.get(line.color_name, (255, 255, 255))
+                color = LINE_COLORS.get(line.color_name, (255, 255, 255))
+
+                # Points may be a list of tuples or an (n, 2) array
+                points = np.asarray(line.points, dtype=np.int32)
+                if len(points) == 0:
+                    continue
 
-                # Draw line segments
-                for i in range(len(line.points) - 1):
-                    cv2.line(vis_image, line.points[i], line.points[i + 1], color, 3)
+                # Draw all line segments in one call
+                if len(points) > 1:
+                    cv2.polylines(vis_image, [points], False, color, 3)
 
                 # Draw points
-                for point in line.points:
+                point_list = points.tolist()
+                for point in point_list:
                     cv2.circle(vis_image, point, 4, color, -1)
 
                 # Add confidence text
-                if line.points:
-                    text_pos = (line.points[0][0], line.points[0][1] - 10)
+                if point_list:
+                    text_pos = (point_list[0][0], point_list[0][1] - 10)
                     cv2.putText(vis_image, f"{line.color_name}: {line.confidence:.2f}",
                                 text_pos, cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
 
             return vis_image
 
         except Exception as e:
-            logging.error(f"Visualization failed: {e}")
+            frame_log.error(f"Visualization failed: {e}")
             return image
 
 
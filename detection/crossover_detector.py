@@ -5,10 +5,25 @@ Handles geometric intersection detection between lines
 import cv2
 import numpy as np
 import logging
+import math
 import time
+from collections import deque
 from typing import List, Tuple, Optional, Dict
 from dataclasses import dataclass
 from .color_detector import DetectedLine
+from .kernels import NUMBA_AVAILABLE, SIN_10_DEGREES, segment_intersections
+
+frame_log = logging.getLogger('zigzag.frame')
+
+# Packed record for statistics-only crossover history. Timestamps stay float64
+# since float32 epoch seconds are only accurate to about two minutes.
+HISTORY_DTYPE = np.dtype([
+    ('x', np.int16), ('y', np.int16),
+    ('angle', np.float16), ('conf', np.float16),
+    ('ts', np.float64),
+    ('l1', np.uint8), ('l2', np.uint8)
+])
+MAX_HISTORY = 1000
 
 
 @dataclass
@@ -34,10 +49,35 @@ class CrossoverDetector:
 
     def __init__(self, config_manager):
         self.config = config_manager
-        self.crossover_history = []
-        self.recent_crossovers = []
+        self.recent_crossovers = deque()  # Appended in time order, expired from the left
         self.last_detection_time = 0
 
+        # Ring buffer of packed records used for statistics
+        self._history_arr = np.zeros(MAX_HISTORY, dtype=HISTORY_DTYPE)
+        self._history_index = 0
+        self._history_count = 0
+        self._line_ids = {}
+
+    def _line_id(self, line_name: str) -> int:
+        """Map a line name to a small integer id for packed storage"""
+        line_id = self._line_ids.get(line_name)
+        if line_id is None:
+            line_id = len(self._line_ids) % 256
+            self._line_ids[line_name] = line_id
+        return line_id
+
+    def _record_history(self, crossover: Crossover):
+        """Store a crossover in the packed history ring buffer"""
+        x, y = crossover.intersection_point
+        self._history_arr[self._history_index] = (
+            np.clip(x, -32768, 32767), np.clip(y, -32768, 32767),
+            crossover.angle, crossover.combined_confidence,
+            crossover.timestamp,
+            self._line_id(crossover.line1_name), self._line_id(crossover.line2_name)
+        )
+        self._history_index = (self._history_index + 1) % MAX_HISTORY
+        self._history_count = min(self._history_count + 1, MAX_HISTORY)
+
     def line_segment_intersection(self, p1: Tuple[int, int], p2: Tuple[int, int],
                                   p3: Tuple[int, int], p4: Tuple[int, int]) -> Optional[Tuple[float, float]]:
         """Calculate intersection point of two line segments"""
@@ -73,7 +113,7 @@ class CrossoverDetector:
             return None
 
         except Exception as e:
-            logging.error(f"Line intersection calculation failed: {e}")
+            frame_log.error(f"Line intersection calculation failed: {e}")
             return None
 
     def calculate_intersection_angle(self, p1: Tuple[int, int], p2: Tuple[int, int],
@@ -97,54 +137,140 @@ class CrossoverDetector:
             return min(angle_deg, 180 - angle_deg)
 
         except Exception as e:
-            logging.error(f"Angle calculation failed: {e}")
+            frame_log.error(f"Angle calculation failed: {e}")
             return 0.0
 
-    def find_line_intersections(self, line1: DetectedLine, line2: DetectedLine) -> List[Dict]:
-        """Find all intersections between two lines"""
+    def find_line_intersections(self, line1: DetectedLine, line2: DetectedLine,
+                                min_confidence: float = 0.0) -> List[Dict]:
+        """Find all intersections between two lines
+
+        Candidates are rejected with the cheapest test first: a line pair whose
+        best possible confidence is below min_confidence is skipped outright,
+        and shallow segment pairs are rejected from the cross product before
+        the intersection point or angle is computed.
+        """
         intersections = []
 
         try:
-            # Check each segment of line1 against each segment of line2
-            for i in range(len(line1.points) - 1):
-                for j in range(len(line2.points) - 1):
-                    p1, p2 = line1.points[i], line1.points[i + 1]
-                    p3, p4 = line2.points[j], line2.points[j + 1]
+            if len(line1.points) < 2 or len(line2.points) < 2:
+                return intersections
 
-                    intersection = self.line_segment_intersection(p1, p2, p3, p4)
+            # Best case angle_factor is 1.0, so this bounds every intersection of the pair
+            line_confidence = line1.confidence + line2.confidence
+            if (line_confidence + 1.0) / 3.0 < min_confidence:
+                return intersections
 
-                    if intersection:
-                        # Calculate intersection angle
-                        angle = self.calculate_intersection_angle(p1, p2, p3, p4)
+            # Shallow intersections get a halved angle_factor of at most 10/45
+            shallow_rejected = (line_confidence + 0.5 * 10 / 45.0) / 3.0 < min_confidence
 
-                        # Calculate confidence based on angle and line quality
-                        angle_factor = min(angle / 45.0, 1.0)  # Better if closer to 45°
-                        if angle < 10:  # Very shallow angles are less reliable
-                            angle_factor *= 0.5
+            if NUMBA_AVAILABLE:
+                candidates = self._compiled_segment_intersections(line1.points, line2.points,
+                                                                  shallow_rejected)
+            else:
+                candidates = self._segment_intersections(line1.points, line2.points,
+                                                         shallow_rejected)
+
+            for i, j, intersection, angle in candidates:
+                # Calculate confidence based on angle and line quality
+                angle_factor = min(angle / 45.0, 1.0)  # Better if closer to 45°
+                if angle < 10:  # Very shallow angles are less reliable
+                    angle_factor *= 0.5
 
-                        confidence = (line1.confidence + line2.confidence + angle_factor) / 3.0
+                confidence = (line_confidence + angle_factor) / 3.0
 
-                        intersections.append({
-                            'point': (int(intersection[0]), int(intersection[1])),
-                            'angle': angle,
-                            'confidence': confidence,
-                            'line1_segment': (i, p1, p2),
-                            'line2_segment': (j, p3, p4)
-                        })
+                intersections.append({
+                    'point': (int(intersection[0]), int(intersection[1])),
+                    'angle': angle,
+                    'confidence': confidence,
+                    'line1_segment': (i, line1.points[i], line1.points[i + 1]),
+                    'line2_segment': (j, line2.points[j], line2.points[j + 1])
+                })
 
         except Exception as e:
-            logging.error(f"Failed to find intersections: {e}")
+            frame_log.error(f"Failed to find intersections: {e}")
 
         return intersections
 
-    def detect_crossovers(self, detected_lines: List[DetectedLine]) -> List[Crossover]:
-        """Detect crossovers between all line pairs"""
+    @staticmethod
+    def _compiled_segment_intersections(points1: List[Tuple[int, int]], points2: List[Tuple[int, int]],
+                                        reject_shallow: bool) -> List[Tuple]:
+        """Intersect all segment pairs with the compiled kernel"""
+        result = segment_intersections(np.asarray(points1, dtype=np.float64),
+                                       np.asarray(points2, dtype=np.float64),
+                                       reject_shallow)
+        n2 = len(points2) - 1
+        candidates = []
+        for row in np.flatnonzero(~np.isnan(result[:, 0])):
+            i, j = divmod(int(row), n2)
+            x, y, angle = result[row]
+            candidates.append((i, j, (x, y), float(angle)))
+        return candidates
+
+    @staticmethod
+    def _segment_intersections(points1: List[Tuple[int, int]], points2: List[Tuple[int, int]],
+                               reject_shallow: bool) -> List[Tuple]:
+        """Intersect all segment pairs in Python, returning (i, j, point, angle)"""
+        candidates = []
+
+        # Precompute segment vectors and lengths for both lines
+        segments1 = CrossoverDetector._segment_vectors(points1)
+        segments2 = CrossoverDetector._segment_vectors(points2)
+
+        # Check each segment of line1 against each segment of line2
+        for i, (p1, dx1, dy1, length1) in enumerate(segments1):
+            for j, (p3, dx2, dy2, length2) in enumerate(segments2):
+                # Cross product = |v1||v2|sin(theta)
+                denominator = dx1 * dy2 - dy1 * dx2
+
+                # Check if lines are parallel
+                if abs(denominator) < 1e-10:
+                    continue
+
+                sin_theta = min(abs(denominator) / (length1 * length2), 1.0)
+                if reject_shallow and sin_theta < SIN_10_DEGREES:
+                    continue
+
+                # Check if intersection is within both line segments
+                dx3, dy3 = p1[0] - p3[0], p1[1] - p3[1]
+                t1 = (dx2 * dy3 - dy2 * dx3) / denominator
+                t2 = (dx1 * dy3 - dy1 * dx3) / denominator
+                if not (0 <= t1 <= 1 and 0 <= t2 <= 1):
+                    continue
+
+                intersection = (p1[0] + t1 * dx1, p1[1] + t1 * dy1)
+
+                # Acute intersection angle follows directly from sin(theta)
+                angle = math.degrees(math.asin(sin_theta))
+
+                candidates.append((i, j, intersection, angle))
+
+        return candidates
+
+    @staticmethod
+    def _segment_vectors(points: List[Tuple[int, int]]) -> List[Tuple]:
+        """Return (start, dx, dy, length) for each segment of a polyline"""
+        segments = []
+        for k in range(len(points) - 1):
+            p1, p2 = points[k], points[k + 1]
+            dx, dy = p2[0] - p1[0], p2[1] - p1[1]
+            segments.append((p1, dx, dy, math.hypot(dx, dy)))
+        return segments
+
+    def detect_crossovers(self, detected_lines: List[DetectedLine], settings=None) -> List[Crossover]:
+        """Detect crossovers between all line pairs
+
+        settings is a DetectionSettings snapshot; it is read from the config
+        when not given.
+        """
         crossovers = []
         current_time = time.time()
 
         try:
-            min_confidence = self.config.get('detection', 'confidence_threshold', 0.7)
-            tolerance = self.config.get('detection', 'intersection_tolerance', 8)
+            if settings is None:
+                settings = self.config.detection_settings()
+            min_confidence = settings.confidence_threshold
+            tolerance = settings.intersection_tolerance
+            debounce_time = settings.debounce_seconds
 
             # Find different line types for crossover detection
             line_pairs = []
@@ -155,7 +281,7 @@ class CrossoverDetector:
 
             # Process each line pair
             for line1, line2 in line_pairs:
-                intersections = self.find_line_intersections(line1, line2)
+                intersections = self.find_line_intersections(line1, line2, min_confidence)
 
                 for intersection_data in intersections:
                     if intersection_data['confidence'] >= min_confidence:
@@ -171,9 +297,9 @@ class CrossoverDetector:
                         )
 
                         # Check if this is a new crossover
-                        if self.is_new_crossover(crossover, tolerance):
+                        if self.is_new_crossover(crossover, tolerance, debounce_time):
                             crossovers.append(crossover)
-                            self.crossover_history.append(crossover)
+                            self._record_history(crossover)
 
                             logging.info(f"Crossover detected: {line1.color_name} × {line2.color_name} "
                                          f"at {crossover.intersection_point}, "
@@ -181,7 +307,7 @@ class CrossoverDetector:
                                          f"angle: {crossover.angle:.1f}°")
 
         except Exception as e:
-            logging.error(f"Crossover detection failed: {e}")
+            frame_log.error(f"Crossover detection failed: {e}")
 
         # Clean up old crossovers
         self.cleanup_old_crossovers()
@@ -189,11 +315,13 @@ class CrossoverDetector:
 
         return crossovers
 
-    def is_new_crossover(self, crossover: Crossover, tolerance: int) -> bool:
+    def is_new_crossover(self, crossover: Crossover, tolerance: int,
+                         debounce_time: Optional[float] = None) -> bool:
         """Check if crossover is new (not detected recently)"""
         try:
             current_time = crossover.timestamp
-            debounce_time = self.config.get('detection', 'debounce_seconds', 60)
+            if debounce_time is None:
+                debounce_time = self.config.get('detection', 'debounce_seconds', 60)
 
             for recent in self.recent_crossovers:
                 # Check spatial distance
@@ -222,7 +350,7 @@ class CrossoverDetector:
             return True
 
         except Exception as e:
-            logging.error(f"Failed to check crossover uniqueness: {e}")
+            frame_log.error(f"Failed to check crossover uniqueness: {e}")
             return True  # Default to allowing crossover
 
     def cleanup_old_crossovers(self):
@@ -231,41 +359,35 @@ class CrossoverDetector:
             current_time = time.time()
             retention_time = 3600  # Keep for 1 hour
 
-            # Remove old crossovers from recent list
-            self.recent_crossovers = [
-                crossover for crossover in self.recent_crossovers
-                if current_time - crossover.timestamp < retention_time
-            ]
-
-            # Limit history size
-            max_history = 1000
-            if len(self.crossover_history) > max_history:
-                self.crossover_history = self.crossover_history[-max_history:]
+            # Entries are in time order, so expired ones are all at the left
+            recent = self.recent_crossovers
+            while recent and current_time - recent[0].timestamp >= retention_time:
+                recent.popleft()
 
         except Exception as e:
-            logging.error(f"Failed to cleanup crossovers: {e}")
+            frame_log.error(f"Failed to cleanup crossovers: {e}")
 
     def get_statistics(self) -> Dict:
         """Get detection statistics"""
         try:
             current_time = time.time()
+            history = self._history_arr[:self._history_count]
 
             # Count crossovers in different time periods
-            last_hour = sum(1 for c in self.crossover_history
-                            if current_time - c.timestamp < 3600)
-            last_day = sum(1 for c in self.crossover_history
-                           if current_time - c.timestamp < 86400)
+            age = current_time - history['ts']
+            last_hour = int(np.count_nonzero(age < 3600))
+            last_day = int(np.count_nonzero(age < 86400))
 
             # Average confidence
-            if self.crossover_history:
-                avg_confidence = np.mean([c.combined_confidence for c in self.crossover_history])
-                avg_angle = np.mean([c.angle for c in self.crossover_history])
+            if self._history_count:
+                avg_confidence = float(history['conf'].mean(dtype=np.float64))
+                avg_angle = float(history['angle'].mean(dtype=np.float64))
             else:
                 avg_confidence = 0.0
                 avg_angle = 0.0
 
             return {
-                'total_crossovers': len(self.crossover_history),
+                'total_crossovers': self._history_count,
                 'recent_crossovers': len(self.recent_crossovers),
                 'last_hour': last_hour,
                 'last_day': last_day,
@@ -308,60 +430,85 @@ class CrossoverDetector:
 class CrossoverVisualizer:
     """Visualizes crossovers on images"""
 
+    RECENT_SECONDS = 300  # Age limit for recent_only drawing
+
+    # Confidence tiers: (lower bound, marker color)
+    CONFIDENCE_TIERS = (
+        (0.8, (0, 255, 0)),  # Green for high confidence
+        (0.6, (0, 255, 255)),  # Yellow for medium confidence
+        (float('-inf'), (0, 0, 255)),  # Red for low confidence
+    )
+
+    # Marker outlines around the origin, offset to each crossover so a whole
+    # tier draws in one polylines/fillPoly call
+    RING_POLY = cv2.ellipse2Poly((0, 0), (8, 8), 0, 0, 360, 10)
+    DOT_POLY = cv2.ellipse2Poly((0, 0), (3, 3), 0, 0, 360, 30)
+
     @staticmethod
     def draw_crossovers(image: np.ndarray, crossovers: List[Crossover],
-                        recent_only: bool = True) -> np.ndarray:
-        """Draw crossovers on image"""
+                        recent_only: bool = True, draw_labels: bool = True,
+                        inplace: bool = False) -> np.ndarray:
+        """Draw crossovers on image, or onto image itself when inplace"""
         try:
-            vis_image = image.copy()
+            vis_image = image if inplace else image.copy()
             current_time = time.time()
 
+            # Bucket crossovers by confidence tier
+            buckets = [[] for _ in CrossoverVisualizer.CONFIDENCE_TIERS]
             for crossover in crossovers:
                 # Skip old crossovers if recent_only is True
-                if recent_only and current_time - crossover.timestamp > 300:  # 5 minutes
+                if recent_only and current_time - crossover.timestamp > CrossoverVisualizer.RECENT_SECONDS:
                     continue
 
-                x, y = crossover.intersection_point
-
-                # Color based on confidence
-                if crossover.combined_confidence > 0.8:
-                    color = (0, 255, 0)  # Green for high confidence
-                elif crossover.combined_confidence > 0.6:
-                    color = (0, 255, 255)  # Yellow for medium confidence
-                else:
-                    color = (0, 0, 255)  # Red for low confidence
-
-                # Draw crossover marker
-                cv2.circle(vis_image, (x, y), 8, color, 2)
-                cv2.circle(vis_image, (x, y), 3, (255, 255, 255), -1)
-
-                # Draw confidence and angle text
-                text = f"{crossover.combined_confidence:.2f} ({crossover.angle:.0f}°)"
-                text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.4, 1)[0]
-                text_x = max(0, min(x - text_size[0] // 2, vis_image.shape[1] - text_size[0]))
-                text_y = max(text_size[1], y - 15)
-
-                # Text background
-                cv2.rectangle(vis_image, (text_x - 2, text_y - text_size[1] - 2),
-                              (text_x + text_size[0] + 2, text_y + 2), (0, 0, 0), -1)
-
-                cv2.putText(vis_image, text, (text_x, text_y),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
-
-                # Age indicator
-                age_minutes = (current_time - crossover.timestamp) / 60
-                if age_minutes < 1:
-                    age_text = "NEW"
-                    age_color = (0, 255, 0)
-                else:
-                    age_text = f"{age_minutes:.0f}m"
-                    age_color = (128, 128, 128)
-
-                cv2.putText(vis_image, age_text, (x + 15, y),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.3, age_color, 1)
+                confidence = crossover.combined_confidence
+                for tier, (threshold, _) in enumerate(CrossoverVisualizer.CONFIDENCE_TIERS):
+                    if confidence > threshold:
+                        buckets[tier].append(crossover)
+                        break
+
+            # Marker pass: ring in tier color plus white center dot
+            for (_, color), bucket in zip(CrossoverVisualizer.CONFIDENCE_TIERS, buckets):
+                if not bucket:
+                    continue
+                points = np.array([crossover.intersection_point for crossover in bucket], dtype=np.int32)[:, None]
+                cv2.polylines(vis_image, list(CrossoverVisualizer.RING_POLY + points), True, color, 2)
+                cv2.fillPoly(vis_image, list(CrossoverVisualizer.DOT_POLY + points), (255, 255, 255))
+
+            if not draw_labels:
+                return vis_image
+
+            # Label pass: confidence/angle text and age indicator
+            image_width = vis_image.shape[1]
+            for (_, color), bucket in zip(CrossoverVisualizer.CONFIDENCE_TIERS, buckets):
+                for crossover in bucket:
+                    x, y = crossover.intersection_point
+
+                    text = f"{crossover.combined_confidence:.2f} ({crossover.angle:.0f}°)"
+                    text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.4, 1)[0]
+                    text_x = max(0, min(x - text_size[0] // 2, image_width - text_size[0]))
+                    text_y = max(text_size[1], y - 15)
+
+                    # Text background
+                    cv2.rectangle(vis_image, (text_x - 2, text_y - text_size[1] - 2),
+                                  (text_x + text_size[0] + 2, text_y + 2), (0, 0, 0), -1)
+
+                    cv2.putText(vis_image, text, (text_x, text_y),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
+
+                    # Age indicator
+                    age_minutes = (current_time - crossover.timestamp) / 60
+                    if age_minutes < 1:
+                        age_text = "NEW"
+                        age_color = (0, 255, 0)
+                    else:
+                        age_text = f"{age_minutes:.0f}m"
+                        age_color = (128, 128, 128)
+
+                    cv2.putText(vis_image, age_text, (x + 15, y),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.3, age_color, 1)
 
             return vis_image
 
         except Exception as e:
-            logging.error(f"Crossover visualization failed: {e}")
+            frame_log.error(f"Crossover visualization failed: {e}")
             return image
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Compiled kernels for ZigZag Detector
+Numba-accelerated inner loops with a graceful fallback when Numba is missing
+"""
+
+import math
+import logging
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Intersections shallower than 10 degrees get a reduced angle factor
+SIN_10_DEGREES = math.sin(math.radians(10))
+
+
+@njit(parallel=True, cache=True)
+def segment_intersections(points1, points2, reject_shallow):
+    """Intersect every segment of one polyline with every segment of another
+
+    Returns an (n1 * n2, 3) array of (x, y, acute angle in degrees) indexed by
+    i * n2 + j, with NaN rows where segments i and j do not intersect. Shallow
+    pairs (under 10 degrees) are skipped when reject_shallow is set.
+    """
+    n1 = points1.shape[0] - 1
+    n2 = points2.shape[0] - 1
+    out = np.full((n1 * n2, 3), np.nan)
+
+    for i in prange(n1):
+        x1 = points1[i, 0]
+        y1 = points1[i, 1]
+        dx1 = points1[i + 1, 0] - x1
+        dy1 = points1[i + 1, 1] - y1
+        length1 = math.sqrt(dx1 * dx1 + dy1 * dy1)
+
+        for j in range(n2):
+            x3 = points2[j, 0]
+            y3 = points2[j, 1]
+            dx2 = points2[j + 1, 0] - x3
+            dy2 = points2[j + 1, 1] - y3
+
+            # Cross product = |v1||v2|sin(theta)
+            denominator = dx1 * dy2 - dy1 * dx2
+            if abs(denominator) < 1e-10:
+                continue
+
+            length2 = math.sqrt(dx2 * dx2 + dy2 * dy2)
+            sin_theta = min(abs(denominator) / (length1 * length2), 1.0)
+            if reject_shallow and sin_theta < SIN_10_DEGREES:
+                continue
+
+            dx3 = x1 - x3
+            dy3 = y1 - y3
+            t1 = (dx2 * dy3 - dy2 * dx3) / denominator
+            t2 = (dx1 * dy3 - dy1 * dx3) / denominator
+            if t1 < 0 or t1 > 1 or t2 < 0 or t2 > 1:
+                continue
+
+            row = i * n2 + j
+            out[row, 0] = x1 + t1 * dx1
+            out[row, 1] = y1 + t1 * dy1
+            out[row, 2] = math.degrees(math.asin(sin_theta))
+
+    return out
+
+
+@njit(parallel=True, cache=True)
+def classify_hsv(hsv, bounds):
+    """Classify HSV pixels against up to 32 color ranges in one pass
+
+    bounds is an (n, 6) int32 array of hue_min, hue_max, sat_min, sat_max,
+    val_min, val_max rows. Bit k of the returned uint32 image is set when the
+    pixel lies inside range k. Each range test ORs the six signed differences
+    and reads the sign bit, so the inner loop has no branches.
+    """
+    rows = hsv.shape[0]
+    cols = hsv.shape[1]
+    out = np.zeros((rows, cols), np.uint32)
+
+    for y in prange(rows):
+        for x in range(cols):
+            h = np.int32(hsv[y, x, 0])
+            s = np.int32(hsv[y, x, 1])
+            v = np.int32(hsv[y, x, 2])
+
+            bits = 0
+            for k in range(bounds.shape[0]):
+                d = ((h - bounds[k, 0]) | (bounds[k, 1] - h) |
+                     (s - bounds[k, 2]) | (bounds[k, 3] - s) |
+                     (v - bounds[k, 4]) | (bounds[k, 5] - v))
+                # d >> 31 is -1 when any difference is negative, else 0
+                bits |= ((d >> 31) + 1) << k
+            out[y, x] = bits
+
+    return out
+
+
+@njit(cache=True)
+def mask_line_hits(points, mask, scale):
+    """Sample mask every 5 pixels along a polyline
+
+    points is an (n, 2) int64 array in full image coordinates and mask may be
+    downscaled by the integer scale. Returns (hits, checks): the number of
+    in-bounds samples and how many of them landed on a set mask pixel.
+    """
+    rows = mask.shape[0]
+    cols = mask.shape[1]
+    hits = 0
+    checks = 0
+
+    for i in range(points.shape[0] - 1):
+        x1 = points[i, 0]
+        y1 = points[i, 1]
+        dx = points[i + 1, 0] - x1
+        dy = points[i + 1, 1] - y1
+        steps = max(int(math.sqrt(dx * dx + dy * dy) / 5), 1)
+
+        for j in range(steps):
+            t = j / steps
+            x = int(x1 + t * dx) // scale
+            y = int(y1 + t * dy) // scale
+            if 0 <= y < rows and 0 <= x < cols:
+                checks += 1
+                if mask[y, x] > 0:
+                    hits += 1
+
+    return hits, checks
+
+
+def warm_up():
+    """Compile kernels ahead of the first frame"""
+    if not NUMBA_AVAILABLE:
+        return
+
+    try:
+        dummy = np.array([[0.0, 0.0], [16.0, 16.0]])
+        segment_intersections(dummy, dummy[:, ::-1].copy(), True)
+        classify_hsv(np.zeros((16, 16, 3), np.uint8), np.zeros((1, 6), np.int32))
+        mask_line_hits(np.zeros((2, 2), np.int64), np.zeros((16, 16), np.uint8), 1)
+    except Exception as e:
+        logging.error(f"Kernel warm-up failed: {e}")
@@ -4,9 +4,16 @@ Thread-safe screen capture with user-friendly interface
 """
 
 import sys
+import copy
 import time
+import queue
 import logging
-from datetime import datetime
+import threading
+import zlib
+from collections import deque
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import Optional
 from pathlib import Path
 import cv2
 import numpy as np
@@ -15,18 +22,68 @@ from PySide6.QtWidgets import *
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 
-from config.settings import config
-from capture.window_capture import WindowCapture, RegionSelector
+from config.settings import config, DetectionSettings
+from capture.window_capture import WindowCapture, RegionSelector, DXCAM_AVAILABLE
 from detection.color_detector import ColorDetector, ColorCalibrator
 from detection.crossover_detector import CrossoverDetector, CrossoverVisualizer
+from detection import kernels
 from alerts.telegram_alerter import AlertManager
 
+# Crossovers waiting for the alert thread; beyond this the oldest are dropped
+MAX_PENDING_ALERTS = 32
+
+# Past this many crossovers on the preview only markers are drawn; the
+# labels overlap into noise anyway and cost several calls each
+MAX_LABELED_CROSSOVERS = 12
+
+# Shared look of the instruction boxes at the top of each settings tab
+INSTRUCTIONS_STYLE = "background-color: #3a3a3a; padding: 15px; border-radius: 8px;"
+
+# HSV sliders in a ColorConfigWidget: (config key, label, min, max)
+HSV_SLIDER_PARAMS = (
+    ('hue_min', 'Color Min', 0, 179),
+    ('hue_max', 'Color Max', 0, 179),
+    ('sat_min', 'Brightness Min', 0, 255),
+    ('sat_max', 'Brightness Max', 0, 255),
+    ('val_min', 'Contrast Min', 0, 255),
+    ('val_max', 'Contrast Max', 0, 255),
+)
+
+# Reset values for the two ZigZag lines
+LINE1_DEFAULTS = {
+    'hue_min': 20, 'hue_max': 35,
+    'sat_min': 100, 'sat_max': 255,
+    'val_min': 100, 'val_max': 255,
+    'enabled': True
+}
+LINE2_DEFAULTS = {
+    'hue_min': 120, 'hue_max': 150,
+    'sat_min': 100, 'sat_max': 255,
+    'val_min': 100, 'val_max': 255,
+    'enabled': True
+}
+
+
+def put_dropping_oldest(q, item):
+    """Put item on a bounded queue, discarding the oldest entry when full"""
+    while True:
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+
 
 class SimpleRegionSelector(QDialog):
     """Super simple click-drag region selector"""
 
-    def __init__(self):
+    def __init__(self, window_capture=None):
         super().__init__()
+        # Grabs go through the app's capture backend, reusing its OS handles
+        self.window_capture = window_capture or WindowCapture()
         self.selected_region = None
         self.start_point = None
         self.end_point = None
@@ -35,28 +92,33 @@ class SimpleRegionSelector(QDialog):
     def select_region(self):
         """Show fullscreen selector and return selected region"""
         try:
-            # Take screenshot of entire screen
-            import mss
-            with mss.mss() as sct:
-                # Get primary monitor
+            # Take screenshot of entire screen, through Desktop Duplication
+            # when the capture backend has it
+            frame = self.window_capture.grab_primary_duplicated()
+            if frame is not None:
+                h, w = frame.shape[:2]
+                qt_image = QImage(frame.data, w, h, frame.strides[0], QImage.Format_BGR888)
+                self.screenshot_pixmap = QPixmap.fromImage(qt_image)
+            else:
+                # The capture backend's persistent mss instance; capture and
+                # this dialog both run on the GUI thread
+                sct = self.window_capture.sct
                 monitor = sct.monitors[1]  # Monitor 1 is usually primary
                 screenshot = sct.grab(monitor)
 
                 # Convert to QPixmap
-                img_array = np.array(screenshot)
-                img_array = cv2.cvtColor(img_array, cv2.COLOR_BGRA2RGB)
-                h, w, ch = img_array.shape
-                bytes_per_line = ch * w
-
-                qt_image = QImage(img_array.data, w, h, bytes_per_line, QImage.Format_RGB888)
+                # BGRA bytes are Qt's native 32-bit layout, so wrap mss's buffer
+                # as is; fromImage makes the only copy
+                w, h = screenshot.width, screenshot.height
+                qt_image = QImage(screenshot.raw, w, h, w * 4, QImage.Format_RGB32)
                 self.screenshot_pixmap = QPixmap.fromImage(qt_image)
 
-                # Setup fullscreen dialog
-                self.setup_selector_ui()
+            # Setup fullscreen dialog
+            self.setup_selector_ui()
 
-                # Show dialog
-                if self.exec() == QDialog.Accepted and self.selected_region:
-                    return self.selected_region
+            # Show dialog
+            if self.exec() == QDialog.Accepted and self.selected_region:
+                return self.selected_region
 
         except Exception as e:
             QMessageBox.critical(None, "Screenshot Error",
@@ -119,6 +181,23 @@ class SimpleRegionSelector(QDialog):
         self.selection_overlay.setParent(self.image_label)
         self.selection_overlay.hide()
 
+        # Confirmation shown after each drag; reused so reselecting does
+        # not stack labels
+        self.confirm_label = QLabel()
+        self.confirm_label.setStyleSheet("""
+            QLabel {
+                background-color: rgba(0, 120, 212, 200);
+                color: white;
+                font-size: 18px;
+                font-weight: bold;
+                padding: 20px;
+                border-radius: 10px;
+            }
+        """)
+        self.confirm_label.setAlignment(Qt.AlignCenter)
+        self.confirm_label.setParent(self.image_label)
+        self.confirm_label.hide()
+
     def keyPressEvent(self, event):
         """Handle key presses"""
         if event.key() == Qt.Key_Return or event.key() == Qt.Key_Enter:
@@ -194,7 +273,7 @@ class SimpleRegionSelector(QDialog):
         }
 
         # Show confirmation
-        confirm_text = QLabel(f"""
+        self.confirm_label.setText(f"""
         ✅ SELECTION COMPLETE
 
         📏 Size: {width} x {height} pixels
@@ -202,33 +281,61 @@ class SimpleRegionSelector(QDialog):
 
         Press ENTER to confirm, or drag again to reselect
         """)
+        self.confirm_label.setGeometry(left, top - 120, max(300, width), 100)
+        self.confirm_label.show()
 
-        confirm_text.setStyleSheet("""
-            QLabel {
-                background-color: rgba(0, 120, 212, 200);
-                color: white;
-                font-size: 18px;
-                font-weight: bold;
-                padding: 20px;
-                border-radius: 10px;
-            }
-        """)
-        confirm_text.setAlignment(Qt.AlignCenter)
-        confirm_text.setGeometry(left, top - 120, max(300, width), 100)
-        confirm_text.setParent(self.image_label)
-        confirm_text.show()
+
+def set_style_property(widget, name, value):
+    """Set a property used by the widget's stylesheet selectors and restyle it
+
+    Property selectors are only re-evaluated on a repolish, which redoes the
+    style lookup, so nothing happens when the value is already set.
+    """
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
+
+
+def preview_resizer(shape, size):
+    """Build a resize function for frames of shape to fit size (width, height)
+
+    Returns (resize, scale). The aspect-ratio maths and interpolation choice
+    are done once here rather than per frame. The result is always a new array.
+    """
+    h, w = shape[:2]
+    scale = min(size[0] / w, size[1] / h)
+    target_w, target_h = max(int(w * scale), 1), max(int(h * scale), 1)
+
+    if (target_w, target_h) == (w, h):
+        # Frames live in reused capture buffers, so the preview needs its own copy
+        return (lambda image: image.copy()), 1.0
+
+    # Bilinear still reaches every source pixel down to half size, so the
+    # slower area averaging is only needed for stronger shrinks
+    interpolation = cv2.INTER_AREA if scale < 0.5 else cv2.INTER_LINEAR
+    return partial(cv2.resize, dsize=(target_w, target_h), interpolation=interpolation), scale
+
+
+@dataclass(frozen=True)
+class FrameResult:
+    """Everything the GUI shows for one processed frame"""
+    preview: Optional[np.ndarray]  # BGR preview scaled to the display, None while hidden
+    lines: tuple  # DetectedLine objects found in the frame
+    status: str
 
 
 class DetectionWorker(QThread):
     """Worker thread for detection loop - THREAD-SAFE VERSION"""
 
+    DISPLAY_CROSSOVERS = 5  # Crossovers drawn on the live view
+
     # Signals for thread-safe communication
-    image_ready = Signal(np.ndarray)
-    lines_detected = Signal(list)
+    image_ready = Signal()  # A frame result is waiting in take_display_frame()
     crossover_detected = Signal(object)
     error_occurred = Signal(str)
     status_update = Signal(str)
-    capture_request = Signal()  # Signal to request capture from main thread
 
     def __init__(self, color_detector, crossover_detector, alert_manager):
         super().__init__()
@@ -238,82 +345,257 @@ class DetectionWorker(QThread):
 
         self.running = False
         self.paused = False
-        self.current_image = None
-        self.image_lock = QMutex()
 
-    def set_image(self, image):
-        """Thread-safe way to set current image from main thread"""
-        with QMutexLocker(self.image_lock):
-            self.current_image = image.copy() if image is not None else None
+        # Detection settings snapshot, replaced by the GUI when settings change
+        self.settings = config.detection_settings()
+
+        # Set by stop() to cut any back-off wait short
+        self.stop_event = threading.Event()
+
+        # Capture -> detection handoff holds only the newest frame
+        self.frame_queue = queue.Queue(maxsize=1)
+
+        # Detection -> alert handoff so slow alert channels never stall detection.
+        # Bounded so a network outage cannot pile up stale alerts.
+        self.alert_queue = queue.Queue(maxsize=MAX_PENDING_ALERTS)
+        self.alert_thread = None
+        self.alerts_done = threading.Event()  # Set once detection queues no more alerts
+
+        # Fingerprint of the last processed frame, to skip unchanged frames
+        self.last_signature = None
+
+        # Newest FrameResult; at most one image_ready is in flight
+        self.display_lock = threading.Lock()
+        self.display_frame = None
+        self.display_pending = False
+
+        # Preview rendering state; preview_size and preview_visible are kept
+        # current by the GUI
+        self.preview_size = (800, 600)
+        self.preview_visible = True
+        self.preview_color = config.get('gui', 'preview_color', True)
+        self._preview_key = None  # (frame shape, preview size) the resizer was built for
+        self._preview_resize = None
+        self._preview_scale = 1.0
+        self.display_crossovers = deque(maxlen=self.DISPLAY_CROSSOVERS)
+        self._display_key = None  # display_age_key() of the last rendered preview
+        self._last_lines = ()  # Lines of the last processed frame, for repaints
+
+    def set_image(self, image, copy=True):
+        """Thread-safe way to hand a frame over from main thread
+
+        A frame the worker has not picked up yet is dropped in favour of the
+        new one, so a slow detection pass never builds a backlog. With
+        copy=False the worker takes the array itself, and the caller must not
+        write to it again until the worker has taken a later frame.
+        """
+        if image is None:
+            return
+
+        put_dropping_oldest(self.frame_queue, image.copy() if copy else image)
+
+    def post_display_frame(self, result):
+        """Offer a frame result to the GUI, coalescing with any not yet shown
+
+        Per-frame GUI updates travel together through this single latest-wins
+        slot instead of as separate queued signals.
+        """
+        with self.display_lock:
+            self.display_frame = result
+            if self.display_pending:
+                return
+            self.display_pending = True
+        self.image_ready.emit()
+
+    def render_preview(self, image, detected_lines):
+        """Scale to the preview size and draw detections, staying in BGR
+
+        With every line color unchecked and gui.preview_color off, the preview
+        is handed over as grayscale instead. Runs on this thread. Overlays are drawn on the already shrunken image
+        with their coordinates scaled, so no full-size copy is made.
+        """
+        # Rebuild the resizer only when the frame shape or preview size changes
+        key = (image.shape, self.preview_size)
+        if key != self._preview_key:
+            self._preview_resize, self._preview_scale = preview_resizer(*key)
+            self._preview_key = key
+        # The resize always returns a new array that only this thread holds,
+        # so the overlays below draw onto it in place
+        preview = self._preview_resize(image)
+        scale = self._preview_scale
+
+        def fit(point):
+            return int(point[0] * scale), int(point[1] * scale)
+
+        def fit_all(points):
+            # Scale a whole polyline in one array operation, kept as an (n, 2)
+            # int32 array that visualize_detection draws from directly
+            return (np.asarray(points, dtype=np.float64) * scale).astype(np.int32)
+
+        if detected_lines:
+            lines = [replace(line, points=fit_all(line.points)) for line in detected_lines]
+            preview = ColorDetector.visualize_detection(preview, lines, inplace=True)
+
+        # Crossovers arrive in time order, so expired ones leave from the left
+        # and the ring only ever holds drawable entries
+        now = time.time()
+        cutoff = now - CrossoverVisualizer.RECENT_SECONDS
+        while self.display_crossovers and self.display_crossovers[0].timestamp < cutoff:
+            self.display_crossovers.popleft()
+        self._display_key = self.display_age_key(now)
+
+        if self.display_crossovers:
+            crossovers = [replace(crossover, intersection_point=fit(crossover.intersection_point))
+                          for crossover in self.display_crossovers]
+            preview = CrossoverVisualizer.draw_crossovers(
+                preview, crossovers, recent_only=False,
+                draw_labels=len(crossovers) <= MAX_LABELED_CROSSOVERS, inplace=True)
+        elif not self.settings.colors and not self.preview_color:
+            # No line colors are enabled, so nothing colored is ever drawn
+            # and a third of the bytes will do
+            preview = cv2.cvtColor(preview, cv2.COLOR_BGR2GRAY)
+
+        return preview
+
+    def display_age_key(self, now):
+        """Age of each display crossover as its label shows it, None once expired"""
+        key = []
+        for crossover in self.display_crossovers:
+            age = now - crossover.timestamp
+            if age > CrossoverVisualizer.RECENT_SECONDS:
+                key.append(None)
+            else:
+                key.append(-1 if age < 60 else f"{age / 60:.0f}")  # -1 while labeled NEW
+        return tuple(key)
+
+    def take_display_frame(self):
+        """Take the newest frame result, or None - called from the GUI thread"""
+        with self.display_lock:
+            result, self.display_frame = self.display_frame, None
+            self.display_pending = False
+        return result
+
+    def _alert_loop(self):
+        """Send queued crossover alerts - runs in its own thread"""
+        while True:
+            try:
+                crossover = self.alert_queue.get(timeout=0.2)
+            except queue.Empty:
+                # Exit only once detection has stopped and the queue is drained
+                if self.alerts_done.is_set():
+                    break
+                continue
+            try:
+                self.alert_manager.send_crossover_alert(crossover)
+            except Exception as e:
+                self.error_occurred.emit(f"Alert failed: {e}")
 
     def run(self):
         """Main detection loop - runs in background thread"""
         self.running = True
+        self.stop_event.clear()
+        self.alerts_done.clear()
         loop_count = 0
+        error_backoff = 0.5  # Doubles per consecutive failure, capped at 5s
+        last_error = 0.0
+        status_counts, status = None, ""  # Status text is rebuilt only when counts change
+
+        # Compile detection kernels here rather than on the GUI thread
+        kernels.warm_up()
+
+        self.alert_thread = threading.Thread(target=self._alert_loop, daemon=True)
+        self.alert_thread.start()
 
         while self.running:
             try:
                 if self.paused:
-                    self.msleep(100)
+                    self.stop_event.wait(0.1)
                     continue
 
                 loop_count += 1
 
-                # Request capture from main thread (thread-safe)
-                self.capture_request.emit()
-
-                # Wait a bit for image to be set
-                self.msleep(100)
-
-                # Get current image (thread-safe)
-                image = None
-                with QMutexLocker(self.image_lock):
-                    if self.current_image is not None:
-                        image = self.current_image.copy()
+                # Wait for the next captured frame (paced by the capture timer)
+                try:
+                    image = self.frame_queue.get(timeout=1.0)
+                except queue.Empty:
+                    self.status_update.emit(f"Waiting for image... (loop {loop_count})")
+                    continue
 
+                # None is the wake-up sentinel from stop()
                 if image is None:
-                    self.status_update.emit(f"Waiting for image... (loop {loop_count})")
-                    self.msleep(1000)
                     continue
 
                 if image.size == 0:
                     self.error_occurred.emit("Empty image captured")
-                    self.msleep(1000)
+                    self.stop_event.wait(1.0)
                     continue
 
-                # Emit image for display
-                self.image_ready.emit(image.copy())
+                # One settings snapshot for the whole frame
+                settings = self.settings
+
+                # Skip the whole pipeline when neither the chart nor what is
+                # done with it has changed. The CRC covers every pixel so thin
+                # line changes are never missed.
+                signature = (image.shape, zlib.crc32(image), settings, self.preview_size)
+                if signature == self.last_signature:
+                    # An idle chart still needs a repaint when a crossover
+                    # label ages or a crossover expires
+                    if (self.preview_visible and self.display_crossovers
+                            and self.display_age_key(time.time()) != self._display_key):
+                        self.post_display_frame(FrameResult(
+                            preview=self.render_preview(image, self._last_lines),
+                            lines=self._last_lines,
+                            status=status
+                        ))
+                    continue
+                self.last_signature = signature
 
                 # Detect lines
-                detected_lines = self.color_detector.detect_lines(image)
-                self.lines_detected.emit(detected_lines)
+                detected_lines = self.color_detector.detect_lines(image, settings)
 
                 # Detect crossovers
-                crossovers = self.crossover_detector.detect_crossovers(detected_lines)
+                crossovers = self.crossover_detector.detect_crossovers(detected_lines, settings)
 
-                # Send alerts and emit signals for new crossovers
+                # Queue alerts and emit signals for new crossovers
                 for crossover in crossovers:
                     self.crossover_detected.emit(crossover)
-                    try:
-                        self.alert_manager.send_crossover_alert(crossover)
-                    except Exception as e:
-                        self.error_occurred.emit(f"Alert failed: {e}")
-
-                self.status_update.emit(f"Scanning... Lines: {len(detected_lines)}, Crossovers: {len(crossovers)}")
-
-                # Wait for next iteration
-                fps = config.get('capture', 'fps', 2)
-                sleep_ms = int(1000 / max(fps, 0.1))
-                self.msleep(sleep_ms)
+                    self.display_crossovers.append(crossover)
+                    put_dropping_oldest(self.alert_queue, crossover)
+
+                counts = (len(detected_lines), len(crossovers))
+                if counts != status_counts:
+                    status_counts = counts
+                    status = f"Scanning... Lines: {counts[0]}, Crossovers: {counts[1]}"
+
+                # Render the preview here so the GUI thread only paints it
+                self._last_lines = tuple(detected_lines)
+                self.post_display_frame(FrameResult(
+                    preview=self.render_preview(image, detected_lines) if self.preview_visible else None,
+                    lines=self._last_lines,
+                    status=status
+                ))
+                error_backoff = 0.5
 
             except Exception as e:
-                self.error_occurred.emit(f"Detection error: {e}")
-                self.msleep(2000)
+                # Report at most once per second and back off while failures persist
+                now = time.monotonic()
+                if now - last_error >= 1.0:
+                    self.error_occurred.emit(f"Detection error: {e}")
+                    last_error = now
+                self.stop_event.wait(error_backoff)
+                error_backoff = min(error_backoff * 2, 5.0)
+
+        # Let the alert thread drain what is queued, then exit
+        self.alerts_done.set()
 
     def stop(self):
         """Stop the detection loop"""
         self.running = False
+        self.stop_event.set()
+        put_dropping_oldest(self.frame_queue, None)  # Wake a blocked frame wait
         self.wait(5000)  # Wait up to 5 seconds for thread to finish
+        if self.alert_thread is not None:
+            self.alert_thread.join(timeout=5.0)
 
     def pause(self):
         """Pause detection"""
@@ -324,9 +606,64 @@ class DetectionWorker(QThread):
         self.paused = False
 
 
+class ConfigWriter(QThread):
+    """Writes config.json off the GUI thread, coalescing queued saves"""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = queue.Queue()
+
+    def request_save(self):
+        """Queue a save of the current config - called from the GUI thread"""
+        # Snapshot now so the GUI can keep editing while the file is written
+        self.requests.put(copy.deepcopy(config.config))
+
+    def stop(self):
+        """Let the thread exit once queued saves are written, without waiting"""
+        self.requests.put(None)
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            data = self.requests.get()
+
+            # Only the newest snapshot needs writing; a None sentinel stops
+            # the thread once it is written
+            while True:
+                try:
+                    item = self.requests.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                else:
+                    data = item
+
+            if data is None:
+                break
+            config.save_config(data)
+
+
+class TelegramTester(QThread):
+    """Runs a Telegram connection test off the GUI thread"""
+
+    result_ready = Signal(bool, str)  # success, message
+
+    def __init__(self, telegram):
+        super().__init__()
+        self.telegram = telegram
+
+    def run(self):
+        success, message = self.telegram.test_connection()
+        self.result_ready.emit(success, message)
+
+
 class ImageDisplayWidget(QLabel):
     """Simplified image display widget"""
 
+    preview_resized = Signal(tuple)  # New (width, height) for rendered previews
+    visibility_changed = Signal(bool)  # Whether previews would be seen at all
+
     def __init__(self):
         super().__init__()
         self.setMinimumSize(800, 600)
@@ -343,49 +680,130 @@ class ImageDisplayWidget(QLabel):
             }
         """)
 
-        self.current_pixmap = None
+        self._preview_buf = None  # BGR preview rendered by the detection worker
+        self._preview_qimage = None  # Zero-copy QImage view of _preview_buf, painted directly
 
-    def update_image(self, cv_image, detected_lines=None, crossovers=None):
-        """Update the displayed image with detections"""
-        try:
-            # Create visualization
-            vis_image = cv_image.copy()
+        # Window drags fire a resize per mouse move; report only the final size
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(16)
+        self._resize_timer.timeout.connect(self.emit_preview_size)
 
-            if detected_lines:
-                vis_image = ColorDetector(config).visualize_detection(vis_image, detected_lines)
+    def preview_size(self):
+        """Size (width, height) previews should be rendered at"""
+        return self.width(), self.height()
 
-            if crossovers:
-                vis_image = CrossoverVisualizer.draw_crossovers(vis_image, crossovers[-5:])
+    def emit_preview_size(self):
+        self.preview_resized.emit(self.preview_size())
 
-            # Convert BGR to RGB
-            rgb_image = cv2.cvtColor(vis_image, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_image.shape
-            bytes_per_line = ch * w
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._resize_timer.start()
 
-            # Create Qt image
-            qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.visibility_changed.emit(True)
 
-            # Scale to fit widget while maintaining aspect ratio
-            pixmap = QPixmap.fromImage(qt_image)
-            scaled_pixmap = pixmap.scaled(
-                self.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation
-            )
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.visibility_changed.emit(False)
 
-            self.setPixmap(scaled_pixmap)
-            self.current_pixmap = scaled_pixmap
+    def show_preview(self, bgr_image):
+        """Display a BGR or grayscale preview already scaled by the detection worker"""
+        try:
+            if bgr_image.ndim == 2:
+                image_format, packed = QImage.Format_Grayscale8, (1,)
+            else:
+                image_format, packed = QImage.Format_BGR888, (3, 1)
+            if bgr_image.strides[1:] != packed:
+                raise ValueError("Preview rows must hold packed pixels")
+
+            # Same-sized previews cover exactly the old one, so only that
+            # rectangle needs repainting
+            h, w = bgr_image.shape[:2]
+            same_size = self._preview_buf is not None and self._preview_buf.shape == bgr_image.shape
+
+            # The QImage reads the array in place, so keep the array alive with it
+            # Qt reads OpenCV's BGR order directly, so no channel swap pass
+            self._preview_buf = bgr_image
+            self._preview_qimage = QImage(bgr_image.data, w, h, bgr_image.strides[0], image_format)
+            if self.text():
+                self.setText("")
+                same_size = False
+
+            # Repaint from the wrapped image; no pixmap is built per frame
+            if same_size:
+                self.update(self.preview_rect())
+            else:
+                self.update()
 
         except Exception as e:
             logging.error(f"Image display error: {e}")
+            self._preview_qimage = None
             self.setText(f"❌ Display error\nCheck the settings")
 
+    def preview_rect(self):
+        """Widget rectangle the current preview is painted into, centred"""
+        w, h = self._preview_qimage.width(), self._preview_qimage.height()
+        return QRect((self.width() - w) // 2, (self.height() - h) // 2, w, h)
+
+    def paintEvent(self, event):
+        """Draw the label frame, then the preview image centred on top"""
+        super().paintEvent(event)
+        if self._preview_qimage is None:
+            return
+
+        painter = QPainter(self)
+        painter.drawImage(self.preview_rect().topLeft(), self._preview_qimage)
+        painter.end()
+
+
+class SettingsCommitter(QObject):
+    """Coalesces bursts of settings writes into one commit per key"""
+
+    committed = Signal()  # Emitted after pending commits have been applied
+
+    def __init__(self, delay_ms=100, parent=None):
+        super().__init__(parent)
+        self.pending = {}
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.flush)
+
+    def schedule(self, key, commit):
+        """Replace any pending commit for key and restart the delay
+
+        A rescheduled key moves to the end, so commits apply in the order
+        of the latest edits.
+        """
+        self.pending.pop(key, None)
+        self.pending[key] = commit
+        self.timer.start()
+
+    def flush(self):
+        """Apply all pending commits now"""
+        self.timer.stop()
+        pending, self.pending = self.pending, {}
+        for commit in pending.values():
+            try:
+                commit()
+            except Exception as e:
+                logging.error(f"Failed to apply setting: {e}")
+
+        if pending:
+            self.committed.emit()
+
 
 class ColorConfigWidget(QGroupBox):
     """Simplified color configuration widget"""
 
-    def __init__(self, line_name, color_config):
+    def __init__(self, line_name, color_config, committer=None):
         super().__init__(color_config.get('name', line_name))
         self.line_name = line_name
         self.color_config = color_config
+        self.committer = committer
         self.setup_ui()
 
     def setup_ui(self):
@@ -401,16 +819,7 @@ class ColorConfigWidget(QGroupBox):
         sliders_layout = QGridLayout()
 
         self.sliders = {}
-        params = [
-            ('hue_min', 'Color Min', 0, 179),
-            ('hue_max', 'Color Max', 0, 179),
-            ('sat_min', 'Brightness Min', 0, 255),
-            ('sat_max', 'Brightness Max', 0, 255),
-            ('val_min', 'Contrast Min', 0, 255),
-            ('val_max', 'Contrast Max', 0, 255)
-        ]
-
-        for i, (param, label, min_val, max_val) in enumerate(params):
+        for i, (param, label, min_val, max_val) in enumerate(HSV_SLIDER_PARAMS):
             row = i // 2
             col_offset = (i % 2) * 3
 
@@ -422,7 +831,9 @@ class ColorConfigWidget(QGroupBox):
             slider = QSlider(Qt.Horizontal)
             slider.setRange(min_val, max_val)
             slider.setValue(self.color_config.get(param, min_val))
-            slider.valueChanged.connect(lambda v, p=param: self.on_slider_changed(p, v))
+            # One shared slot for all sliders; the object name says which param
+            slider.setObjectName(param)
+            slider.valueChanged.connect(self.on_slider_changed)
             sliders_layout.addWidget(slider, row, col_offset + 1)
 
             # Value label
@@ -441,71 +852,106 @@ class ColorConfigWidget(QGroupBox):
         self.setLayout(layout)
 
     def on_enabled_changed(self, state):
-        enabled = state == Qt.Checked
-        color_config = config.get_color_config(self.line_name)
-        color_config['enabled'] = enabled
-        config.set_color_config(self.line_name, color_config)
+        # PySide6 emits a plain int here, which never equals the Qt.Checked enum
+        self.color_config['enabled'] = self.enabled_cb.isChecked()
+
+    def on_slider_changed(self, value):
+        param = self.sender().objectName()
 
-    def on_slider_changed(self, param, value):
         # Update value label
         _, value_label = self.sliders[param]
         value_label.setText(str(value))
 
-        # Update config
-        color_config = config.get_color_config(self.line_name)
-        color_config[param] = value
-        config.set_color_config(self.line_name, color_config)
+        # Update config once the slider settles
+        if self.committer:
+            self.committer.schedule((self.line_name, param), lambda: self.commit_param(param, value))
+        else:
+            self.commit_param(param, value)
+
+    def commit_param(self, param, value):
+        # color_config is the live dict inside config, so this is the commit
+        self.color_config[param] = value
 
     def reset_config(self):
         # Reset to default values for this line type
-        if "line1" in self.line_name:
-            defaults = {
-                'hue_min': 20, 'hue_max': 35,
-                'sat_min': 100, 'sat_max': 255,
-                'val_min': 100, 'val_max': 255,
-                'enabled': True
-            }
-        else:
-            defaults = {
-                'hue_min': 120, 'hue_max': 150,
-                'sat_min': 100, 'sat_max': 255,
-                'val_min': 100, 'val_max': 255,
-                'enabled': True
-            }
+        defaults = LINE1_DEFAULTS if "line1" in self.line_name else LINE2_DEFAULTS
 
-        config.set_color_config(self.line_name, defaults)
-
-        # Update UI
+        # Update UI without each slider scheduling its own commit
         for param, (slider, value_label) in self.sliders.items():
-            slider.setValue(defaults[param])
+            with QSignalBlocker(slider):
+                slider.setValue(defaults[param])
             value_label.setText(str(defaults[param]))
 
+        # One commit for the whole reset, queued after any pending slider
+        # commits so the defaults win. Update in place so the live dict (and
+        # its display name) is kept.
+        if self.committer:
+            self.committer.schedule((self.line_name, 'reset'), lambda: self.color_config.update(defaults))
+        else:
+            self.color_config.update(defaults)
+
         self.enabled_cb.setChecked(defaults['enabled'])
 
 
 class ZigZagDetectorApp(QMainWindow):
     """Simplified main application"""
 
+    CROSSOVER_RING_SIZE = 16384  # Crossovers kept for session statistics
+    MAX_LOG_LINES = 500  # Lines kept in the log display
+
     def __init__(self):
         super().__init__()
 
         # Initialize components
-        self.window_capture = WindowCapture()
+        self.window_capture = WindowCapture(config.get('capture', 'fast_capture', True))
         self.color_detector = ColorDetector(config)
         self.crossover_detector = CrossoverDetector(config)
         self.alert_manager = AlertManager(config)
 
         # State
         self.detected_lines = []
-        self.detected_crossovers = []
-        self.start_time = time.time()
+        self.listed_windows = []  # Windows shown in window_list, in row order
+
+        # Session crossover timestamps as a fixed-size ring buffer
+        self._cx_ts = np.empty(self.CROSSOVER_RING_SIZE, dtype=np.float64)
+        self._cx_head = 0  # Total crossovers seen; write cursor is head % size
+
+        # (head, valid until, stats): reused until a crossover arrives or the
+        # oldest last-hour entry ages out
+        self._stats_cache = None
+
+        # Log lines waiting for the next batched insert into the log display.
+        # Lines past what the display keeps would be pruned right after the
+        # insert, so the queue drops them up front.
+        self._log_queue = deque(maxlen=self.MAX_LOG_LINES)
+        self._log_stamp = (None, "")  # (epoch second, formatted "[HH:MM:SS]")
+
+        # Last value shown per label, so unchanged values are not reformatted
+        self._last_shown = {}
+
+        # Enabled line colors, recounted only when an enable checkbox changes
+        self._enabled_color_count = 0
+        self.recount_enabled_colors()
+        self.start_time = time.monotonic()
         self.is_detecting = False
+        # Two capture buffers used alternately, so frames reach the worker
+        # without a copy: while one is being detected the other is refilled
+        self._frame_ring = [None, None]
+        self._frame_slot = 0
 
         # Detection worker
         self.detection_worker = None
 
+        # Debounces config writes while sliders are dragged
+        self.settings_committer = SettingsCommitter(parent=self)
+        self.settings_committer.committed.connect(self.refresh_detection_settings)
+
+        # Saves config.json without blocking the GUI on disk writes
+        self.config_writer = ConfigWriter()
+        self.config_writer.start()
+        self.telegram_tester = None  # TelegramTester while a test is running
+
         self.setup_ui()
-        self.setup_connections()
         self.load_settings()
 
         # Status timer
@@ -514,9 +960,18 @@ class ZigZagDetectorApp(QMainWindow):
         self.status_timer.start(1000)
 
         # Capture timer for thread-safe screen capture
+        # Paces the whole pipeline. Repeating QTimers are scheduled against a
+        # fixed period, so the rate does not drift with per-frame work; a
+        # precise timer keeps sub-second periods from the 5% coarse slack.
         self.capture_timer = QTimer()
+        self.capture_timer.setTimerType(Qt.PreciseTimer)
         self.capture_timer.timeout.connect(self.do_capture)
 
+        # Log flush timer batches log display updates
+        self.log_flush_timer = QTimer()
+        self.log_flush_timer.timeout.connect(self.flush_log)
+        self.log_flush_timer.start(500)
+
     def setup_ui(self):
         """Setup the simplified UI"""
         self.setWindowTitle("📈 ZigZag Crossover Detector - PocketOption Bot")
@@ -633,6 +1088,8 @@ class ZigZagDetectorApp(QMainWindow):
 
         # Window status
         self.window_status_label = QLabel("❌ No window found yet")
+        # Found/failed looks are property selectors, so switching between
+        # them repolishes instead of parsing a new stylesheet
         self.window_status_label.setStyleSheet("""
             QLabel {
                 font-size: 18px;
@@ -640,6 +1097,14 @@ class ZigZagDetectorApp(QMainWindow):
                 border-radius: 6px;
                 background-color: #444;
             }
+            QLabel[state="found"] {
+                background-color: #28a745;
+                color: white;
+            }
+            QLabel[state="failed"] {
+                background-color: #dc3545;
+                color: white;
+            }
         """)
         step1_layout.addWidget(self.window_status_label)
 
@@ -677,6 +1142,9 @@ class ZigZagDetectorApp(QMainWindow):
 
         # Detection status
         self.detection_status_label = QLabel("🤖 Ready to start scanning")
+        # Running and stopped looks are both in the stylesheet, keyed on the
+        # "running" property, so toggling never re-parses stylesheets
+        self.detection_status_label.setProperty("running", False)
         self.detection_status_label.setStyleSheet("""
             QLabel {
                 font-size: 18px;
@@ -684,12 +1152,17 @@ class ZigZagDetectorApp(QMainWindow):
                 border-radius: 6px;
                 background-color: #444;
             }
+            QLabel[running="true"] {
+                background-color: #28a745;
+                color: white;
+            }
         """)
         step3_layout.addWidget(self.detection_status_label)
 
         # Big start/stop button
         self.main_detection_btn = QPushButton("🚀 START BOT")
         self.main_detection_btn.clicked.connect(self.toggle_detection)
+        self.main_detection_btn.setProperty("running", False)
         self.main_detection_btn.setStyleSheet("""
             QPushButton {
                 font-size: 24px;
@@ -699,6 +1172,12 @@ class ZigZagDetectorApp(QMainWindow):
             QPushButton:hover {
                 background-color: #218838;
             }
+            QPushButton[running="true"] {
+                background-color: #dc3545;
+            }
+            QPushButton[running="true"]:hover {
+                background-color: #c82333;
+            }
         """)
         step3_layout.addWidget(self.main_detection_btn)
 
@@ -709,6 +1188,8 @@ class ZigZagDetectorApp(QMainWindow):
         preview_layout = QVBoxLayout(preview_group)
 
         self.image_display = ImageDisplayWidget()
+        self.image_display.preview_resized.connect(self.on_preview_resized)
+        self.image_display.visibility_changed.connect(self.on_preview_visibility_changed)
         preview_layout.addWidget(self.image_display)
 
         # Simple stats
@@ -733,6 +1214,7 @@ class ZigZagDetectorApp(QMainWindow):
         self.tabs.addTab(capture_widget, "📸 Window Settings")
 
         layout = QVBoxLayout(capture_widget)
+        capture = config.get('capture', default={})
 
         # Instructions
         instructions = QLabel("""
@@ -741,7 +1223,7 @@ class ZigZagDetectorApp(QMainWindow):
         <p><b>Automatic:</b> Click "Find Windows" and select your browser with PocketOption</p>
         <p><b>Manual:</b> Set custom screen region coordinates below</p>
         """)
-        instructions.setStyleSheet("background-color: #3a3a3a; padding: 15px; border-radius: 8px;")
+        instructions.setStyleSheet(INSTRUCTIONS_STYLE)
         layout.addWidget(instructions)
 
         # Window selection
@@ -807,20 +1289,32 @@ class ZigZagDetectorApp(QMainWindow):
         speed_layout.addWidget(QLabel("Scans per second:"))
         self.fps_slider = QSlider(Qt.Horizontal)
         self.fps_slider.setRange(5, 50)  # 0.5 to 5.0 FPS
-        self.fps_slider.setValue(int(config.get('capture', 'fps', 2) * 10))
+        self.fps_slider.setValue(int(capture.get('fps', 2) * 10))
         self.fps_slider.valueChanged.connect(self.on_fps_changed)
         speed_layout.addWidget(self.fps_slider)
 
-        self.fps_label = QLabel(f"{config.get('capture', 'fps', 2):.1f}")
+        self.fps_label = QLabel(f"{capture.get('fps', 2):.1f}")
         speed_layout.addWidget(self.fps_label)
 
         layout.addWidget(speed_group)
+
+        # Capture backend
+        self.fast_capture_cb = QCheckBox("⚡ Fast capture mode (Windows, needs dxcam)")
+        self.fast_capture_cb.setChecked(self.window_capture.fast_capture)
+        self.fast_capture_cb.setEnabled(DXCAM_AVAILABLE)
+        self.fast_capture_cb.toggled.connect(self.on_fast_capture_changed)
+        layout.addWidget(self.fast_capture_cb)
+
+        self.preview_color_cb = QCheckBox("🎨 Color preview while no line colors are enabled")
+        self.preview_color_cb.setChecked(config.get('gui', 'preview_color', True))
+        self.preview_color_cb.toggled.connect(self.on_preview_color_changed)
+        layout.addWidget(self.preview_color_cb)
         layout.addStretch()
 
     def setup_colors_tab(self):
         """Setup color configuration tab"""
         colors_widget = QWidget()
-        self.tabs.addTab(colors_widget, "🎨 Line Colors")
+        self.colors_tab_index = self.tabs.addTab(colors_widget, "🎨 Line Colors")
 
         layout = QVBoxLayout(colors_widget)
 
@@ -831,7 +1325,7 @@ class ZigZagDetectorApp(QMainWindow):
         <p><b>Make sure:</b> Your ZigZag indicators are visible and have different colors</p>
         <p><b>Tip:</b> Use bright, contrasting colors for best detection</p>
         """)
-        instructions.setStyleSheet("background-color: #3a3a3a; padding: 15px; border-radius: 8px;")
+        instructions.setStyleSheet(INSTRUCTIONS_STYLE)
         layout.addWidget(instructions)
 
         # Create scroll area for color configs
@@ -839,17 +1333,37 @@ class ZigZagDetectorApp(QMainWindow):
         scroll_widget = QWidget()
         scroll_layout = QVBoxLayout(scroll_widget)
 
-        # Color configuration widgets
+        scroll.setWidget(scroll_widget)
+        scroll.setWidgetResizable(True)
+        layout.addWidget(scroll)
+
+        # Color configuration widgets are built the first time the tab is shown
         self.color_widgets = {}
+        self.color_scroll_layout = scroll_layout
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+
+    def on_tab_changed(self, index):
+        if index == self.colors_tab_index and self.color_scroll_layout is not None:
+            self.build_color_widgets()
+        elif index == self.logs_tab_index:
+            if self.log_text is None:
+                self.build_log_view()
+            # Lines queued while the tab was in the background
+            self.flush_log()
+
+    def build_color_widgets(self):
+        """Create one ColorConfigWidget per configured line"""
+        scroll_layout = self.color_scroll_layout
+        self.color_scroll_layout = None
+
         for line_name, color_config in config.config['colors'].items():
-            color_widget = ColorConfigWidget(line_name, color_config)
+            color_widget = ColorConfigWidget(line_name, color_config, self.settings_committer)
             self.color_widgets[line_name] = color_widget
+            color_widget.enabled_cb.stateChanged.connect(self.recount_enabled_colors)
+            color_widget.enabled_cb.stateChanged.connect(self.refresh_detection_settings)
             scroll_layout.addWidget(color_widget)
 
         scroll_layout.addStretch()
-        scroll.setWidget(scroll_widget)
-        scroll.setWidgetResizable(True)
-        layout.addWidget(scroll)
 
     def setup_detection_tab(self):
         """Setup detection settings tab"""
@@ -857,6 +1371,7 @@ class ZigZagDetectorApp(QMainWindow):
         self.tabs.addTab(detection_widget, "🔍 Detection Settings")
 
         layout = QVBoxLayout(detection_widget)
+        detection = config.get('detection', default={})
 
         # Instructions
         instructions = QLabel("""
@@ -864,7 +1379,7 @@ class ZigZagDetectorApp(QMainWindow):
         <p>Fine-tune how sensitive the crossover detection is.</p>
         <p><b>Default settings work for most cases</b> - only change if needed.</p>
         """)
-        instructions.setStyleSheet("background-color: #3a3a3a; padding: 15px; border-radius: 8px;")
+        instructions.setStyleSheet(INSTRUCTIONS_STYLE)
         layout.addWidget(instructions)
 
         # Detection parameters
@@ -876,10 +1391,11 @@ class ZigZagDetectorApp(QMainWindow):
         length_layout.addWidget(QLabel("Minimum Line Length (ignore small lines):"))
         self.min_length_slider = QSlider(Qt.Horizontal)
         self.min_length_slider.setRange(10, 100)
-        self.min_length_slider.setValue(config.get('detection', 'min_line_length', 30))
-        self.min_length_slider.valueChanged.connect(self.on_min_length_changed)
+        self.min_length_slider.setValue(detection.get('min_line_length', 30))
         length_layout.addWidget(self.min_length_slider)
         self.min_length_label = QLabel(str(self.min_length_slider.value()))
+        self.min_length_slider.valueChanged.connect(
+            self.detection_slider_handler(self.min_length_label, 'min_line_length', str))
         length_layout.addWidget(self.min_length_label)
         params_layout.addLayout(length_layout)
 
@@ -888,10 +1404,11 @@ class ZigZagDetectorApp(QMainWindow):
         conf_layout.addWidget(QLabel("Detection Confidence (higher = fewer false alerts):"))
         self.confidence_slider = QSlider(Qt.Horizontal)
         self.confidence_slider.setRange(10, 100)
-        self.confidence_slider.setValue(int(config.get('detection', 'confidence_threshold', 0.7) * 100))
-        self.confidence_slider.valueChanged.connect(self.on_confidence_changed)
+        self.confidence_slider.setValue(int(detection.get('confidence_threshold', 0.7) * 100))
         conf_layout.addWidget(self.confidence_slider)
         self.confidence_label = QLabel(f"{self.confidence_slider.value()}%")
+        self.confidence_slider.valueChanged.connect(
+            self.detection_slider_handler(self.confidence_label, 'confidence_threshold', '{}%'.format, scale=100))
         conf_layout.addWidget(self.confidence_label)
         params_layout.addLayout(conf_layout)
 
@@ -900,13 +1417,27 @@ class ZigZagDetectorApp(QMainWindow):
         debounce_layout.addWidget(QLabel("Alert Cooldown (seconds between alerts):"))
         self.debounce_slider = QSlider(Qt.Horizontal)
         self.debounce_slider.setRange(10, 300)
-        self.debounce_slider.setValue(config.get('detection', 'debounce_seconds', 60))
-        self.debounce_slider.valueChanged.connect(self.on_debounce_changed)
+        self.debounce_slider.setValue(detection.get('debounce_seconds', 60))
         debounce_layout.addWidget(self.debounce_slider)
         self.debounce_label = QLabel(str(self.debounce_slider.value()))
+        self.debounce_slider.valueChanged.connect(
+            self.detection_slider_handler(self.debounce_label, 'debounce_seconds', str))
         debounce_layout.addWidget(self.debounce_label)
         params_layout.addLayout(debounce_layout)
 
+        # Detection downscale
+        downscale_layout = QHBoxLayout()
+        downscale_layout.addWidget(QLabel("Detection Downscale (higher = faster, less precise):"))
+        self.downscale_slider = QSlider(Qt.Horizontal)
+        self.downscale_slider.setRange(1, DetectionSettings.MAX_DOWNSCALE)
+        self.downscale_slider.setValue(detection.get('downscale', 1))
+        downscale_layout.addWidget(self.downscale_slider)
+        self.downscale_label = QLabel(f"{self.downscale_slider.value()}x")
+        self.downscale_slider.valueChanged.connect(
+            self.detection_slider_handler(self.downscale_label, 'downscale', '{}x'.format))
+        downscale_layout.addWidget(self.downscale_label)
+        params_layout.addLayout(downscale_layout)
+
         layout.addWidget(params_group)
         layout.addStretch()
 
@@ -916,6 +1447,7 @@ class ZigZagDetectorApp(QMainWindow):
         self.tabs.addTab(alerts_widget, "🔔 Alert Settings")
 
         layout = QVBoxLayout(alerts_widget)
+        alerts = config.get('alerts', default={})
 
         # Instructions
         instructions = QLabel("""
@@ -925,7 +1457,7 @@ class ZigZagDetectorApp(QMainWindow):
         <p><b>Step 3:</b> Get your chat ID and paste it below</p>
         <p><b>Step 4:</b> Test the connection</p>
         """)
-        instructions.setStyleSheet("background-color: #3a3a3a; padding: 15px; border-radius: 8px;")
+        instructions.setStyleSheet(INSTRUCTIONS_STYLE)
         layout.addWidget(instructions)
 
         # Telegram configuration
@@ -934,28 +1466,28 @@ class ZigZagDetectorApp(QMainWindow):
 
         # Enable checkbox
         self.telegram_enabled = QCheckBox("📲 Send Alerts to Telegram")
-        self.telegram_enabled.setChecked(config.get('alerts', 'telegram_enabled', True))
+        self.telegram_enabled.setChecked(alerts.get('telegram_enabled', True))
         self.telegram_enabled.setStyleSheet("font-size: 16px; font-weight: bold;")
         telegram_layout.addWidget(self.telegram_enabled)
 
         # Token entry
         telegram_layout.addWidget(QLabel("Bot Token:"))
         self.token_input = QLineEdit()
-        self.token_input.setText(config.get('alerts', 'telegram_token', ''))
+        self.token_input.setText(alerts.get('telegram_token', ''))
         self.token_input.setPlaceholderText("Paste your bot token here...")
         telegram_layout.addWidget(self.token_input)
 
         # Chat ID entry
         telegram_layout.addWidget(QLabel("Chat ID:"))
         self.chat_id_input = QLineEdit()
-        self.chat_id_input.setText(config.get('alerts', 'telegram_chat_id', ''))
+        self.chat_id_input.setText(alerts.get('telegram_chat_id', ''))
         self.chat_id_input.setPlaceholderText("Paste your chat ID here...")
         telegram_layout.addWidget(self.chat_id_input)
 
         # Test button
-        test_btn = QPushButton("🔗 Test Telegram Connection")
-        test_btn.clicked.connect(self.test_telegram)
-        telegram_layout.addWidget(test_btn)
+        self.telegram_test_btn = QPushButton("🔗 Test Telegram Connection")
+        self.telegram_test_btn.clicked.connect(self.test_telegram)
+        telegram_layout.addWidget(self.telegram_test_btn)
 
         layout.addWidget(telegram_group)
 
@@ -964,11 +1496,11 @@ class ZigZagDetectorApp(QMainWindow):
         other_layout = QVBoxLayout(other_group)
 
         self.sound_enabled = QCheckBox("🔊 Play Sound When Crossover Found")
-        self.sound_enabled.setChecked(config.get('alerts', 'sound_enabled', True))
+        self.sound_enabled.setChecked(alerts.get('sound_enabled', True))
         other_layout.addWidget(self.sound_enabled)
 
         self.log_enabled = QCheckBox("📝 Save Crossovers to Log File")
-        self.log_enabled.setChecked(config.get('alerts', 'log_file_enabled', True))
+        self.log_enabled.setChecked(alerts.get('log_file_enabled', True))
         other_layout.addWidget(self.log_enabled)
 
         layout.addWidget(other_group)
@@ -990,15 +1522,24 @@ class ZigZagDetectorApp(QMainWindow):
     def setup_logs_tab(self):
         """Setup logs tab"""
         logs_widget = QWidget()
-        self.tabs.addTab(logs_widget, "📝 Logs")
+        self.logs_tab_index = self.tabs.addTab(logs_widget, "📝 Logs")
 
-        layout = QVBoxLayout(logs_widget)
+        # The log view is built the first time the tab is shown; until then
+        # lines wait in the bounded log queue
+        self.log_text = None
+        self.logs_layout = QVBoxLayout(logs_widget)
+
+    def build_log_view(self):
+        """Create the log display and its controls"""
+        layout = self.logs_layout
 
         # Log display
-        self.log_text = QTextEdit()
+        # Plain text document capped at MAX_LOG_LINES; Qt drops the oldest lines
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(self.MAX_LOG_LINES)
         self.log_text.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #1e1e1e;
                 color: #d4d4d4;
                 font-family: 'Consolas', 'Monaco', monospace;
@@ -1023,23 +1564,25 @@ class ZigZagDetectorApp(QMainWindow):
         controls.addStretch()
         layout.addLayout(controls)
 
-    def setup_connections(self):
-        """Setup signal connections"""
-        pass
-
     def load_settings(self):
         """Load settings into GUI"""
         try:
-            self.fps_slider.setValue(int(config.get('capture', 'fps', 2) * 10))
-            self.min_length_slider.setValue(config.get('detection', 'min_line_length', 30))
-            self.confidence_slider.setValue(int(config.get('detection', 'confidence_threshold', 0.7) * 100))
-            self.debounce_slider.setValue(config.get('detection', 'debounce_seconds', 60))
-
-            self.telegram_enabled.setChecked(config.get('alerts', 'telegram_enabled', True))
-            self.token_input.setText(config.get('alerts', 'telegram_token', ''))
-            self.chat_id_input.setText(config.get('alerts', 'telegram_chat_id', ''))
-            self.sound_enabled.setChecked(config.get('alerts', 'sound_enabled', True))
-            self.log_enabled.setChecked(config.get('alerts', 'log_file_enabled', True))
+            # Look each section up once
+            capture = config.get('capture', default={})
+            detection = config.get('detection', default={})
+            alerts = config.get('alerts', default={})
+
+            self.fps_slider.setValue(int(capture.get('fps', 2) * 10))
+            self.min_length_slider.setValue(detection.get('min_line_length', 30))
+            self.confidence_slider.setValue(int(detection.get('confidence_threshold', 0.7) * 100))
+            self.debounce_slider.setValue(detection.get('debounce_seconds', 60))
+            self.downscale_slider.setValue(detection.get('downscale', 1))
+
+            self.telegram_enabled.setChecked(alerts.get('telegram_enabled', True))
+            self.token_input.setText(alerts.get('telegram_token', ''))
+            self.chat_id_input.setText(alerts.get('telegram_chat_id', ''))
+            self.sound_enabled.setChecked(alerts.get('sound_enabled', True))
+            self.log_enabled.setChecked(alerts.get('log_file_enabled', True))
 
         except Exception as e:
             logging.error(f"Failed to load settings: {e}")
@@ -1049,9 +1592,20 @@ class ZigZagDetectorApp(QMainWindow):
         """Capture screen in main thread - THREAD SAFE"""
         try:
             if self.detection_worker and self.detection_worker.isRunning():
-                image = self.window_capture.capture_screen()
+                # The worker has not taken the last frame yet; skip the grab
+                # instead of capturing a frame that would only replace it
+                if self.detection_worker.frame_queue.full():
+                    return
+
+                # The queue is empty, so the worker holds at most the frame
+                # from the other slot and this one is free to overwrite
+                slot = self._frame_slot
+                image = self.window_capture.capture_screen(out=self._frame_ring[slot])
                 if image is not None:
-                    self.detection_worker.set_image(image)
+                    # Keep the (possibly reallocated) buffer for the next capture
+                    self._frame_ring[slot] = image
+                    self._frame_slot = 1 - slot
+                    self.detection_worker.set_image(image, copy=False)
         except Exception as e:
             logging.error(f"Screen capture failed: {e}")
 
@@ -1064,15 +1618,7 @@ class ZigZagDetectorApp(QMainWindow):
         window = self.window_capture.auto_detect_window()
         if window:
             self.window_status_label.setText(f"✅ Found: {window.title}")
-            self.window_status_label.setStyleSheet("""
-                QLabel {
-                    font-size: 18px;
-                    padding: 10px;
-                    border-radius: 6px;
-                    background-color: #28a745;
-                    color: white;
-                }
-            """)
+            self.show_window_state("found")
             self.log_message(f"✅ Auto-detected: {window.title}")
             return
 
@@ -1086,35 +1632,19 @@ class ZigZagDetectorApp(QMainWindow):
             self.open_region_selector()
         else:
             self.window_status_label.setText("❌ Setup not completed")
-            self.window_status_label.setStyleSheet("""
-                QLabel {
-                    font-size: 18px;
-                    padding: 10px;
-                    border-radius: 6px;
-                    background-color: #dc3545;
-                    color: white;
-                }
-            """)
+            self.show_window_state("failed")
 
     def open_region_selector(self):
         """Open the simple region selector"""
         self.log_message("📱 Opening chart area selector...")
 
-        selector = SimpleRegionSelector()
+        selector = SimpleRegionSelector(self.window_capture)
         region = selector.select_region()
 
         if region:
             self.window_capture.set_custom_region(region)
             self.window_status_label.setText(f"✅ Chart area selected ({region['width']}x{region['height']})")
-            self.window_status_label.setStyleSheet("""
-                QLabel {
-                    font-size: 18px;
-                    padding: 10px;
-                    border-radius: 6px;
-                    background-color: #28a745;
-                    color: white;
-                }
-            """)
+            self.show_window_state("found")
             self.log_message(f"✅ Chart area selected: {region['width']}x{region['height']}")
         else:
             self.log_message("❌ Chart area selection cancelled")
@@ -1131,6 +1661,9 @@ class ZigZagDetectorApp(QMainWindow):
         if not self.validate_setup():
             return
 
+        # Make sure slider changes still settling are in config
+        self.settings_committer.flush()
+
         self.is_detecting = True
 
         # Create worker
@@ -1138,46 +1671,37 @@ class ZigZagDetectorApp(QMainWindow):
             self.color_detector, self.crossover_detector, self.alert_manager
         )
 
+        self.detection_worker.preview_size = self.image_display.preview_size()
+        self.detection_worker.preview_visible = self.image_display.isVisible()
+
         # Connect signals
         self.detection_worker.image_ready.connect(self.on_image_ready)
-        self.detection_worker.lines_detected.connect(self.on_lines_detected)
         self.detection_worker.crossover_detected.connect(self.on_crossover_detected)
         self.detection_worker.error_occurred.connect(self.on_error_occurred)
         self.detection_worker.status_update.connect(self.on_status_update)
-        self.detection_worker.capture_request.connect(self.do_capture)
 
         # Start worker and capture timer
         self.detection_worker.start()
-        fps = config.get('capture', 'fps', 2)
-        self.capture_timer.start(int(1000 / max(fps, 0.1)))
+        self.capture_timer.start(self.capture_interval_ms(config.get('capture', 'fps', 2)))
+        QTimer.singleShot(0, self.do_capture)  # First frame now, not one period later
 
         # Update UI
         self.main_detection_btn.setText("⏹️ STOP BOT")
-        self.main_detection_btn.setStyleSheet("""
-            QPushButton {
-                font-size: 24px;
-                padding: 25px;
-                background-color: #dc3545;
-            }
-            QPushButton:hover {
-                background-color: #c82333;
-            }
-        """)
-
         self.detection_status_label.setText("🤖 Bot is running and scanning...")
-        self.detection_status_label.setStyleSheet("""
-            QLabel {
-                font-size: 18px;
-                padding: 10px;
-                border-radius: 6px;
-                background-color: #28a745;
-                color: white;
-            }
-        """)
+        self.show_running_style(True)
 
         self.statusBar().showMessage("🔍 Bot running - scanning for crossovers...")
         self.log_message("🚀 Detection started")
 
+    def show_window_state(self, state):
+        """Switch the window status label to its "found" or "failed" look"""
+        set_style_property(self.window_status_label, "state", state)
+
+    def show_running_style(self, running):
+        """Switch the start button and status label between running and stopped looks"""
+        for widget in (self.main_detection_btn, self.detection_status_label):
+            set_style_property(widget, "running", running)
+
     def stop_detection(self):
         """Stop detection"""
         self.is_detecting = False
@@ -1191,26 +1715,8 @@ class ZigZagDetectorApp(QMainWindow):
 
         # Update UI
         self.main_detection_btn.setText("🚀 START BOT")
-        self.main_detection_btn.setStyleSheet("""
-            QPushButton {
-                font-size: 24px;
-                padding: 25px;
-                background-color: #28a745;
-            }
-            QPushButton:hover {
-                background-color: #218838;
-            }
-        """)
-
         self.detection_status_label.setText("🤖 Bot stopped")
-        self.detection_status_label.setStyleSheet("""
-            QLabel {
-                font-size: 18px;
-                padding: 10px;
-                border-radius: 6px;
-                background-color: #444;
-            }
-        """)
+        self.show_running_style(False)
 
         self.statusBar().showMessage("⏹️ Bot stopped")
         self.log_message("⏹️ Detection stopped")
@@ -1226,9 +1732,7 @@ class ZigZagDetectorApp(QMainWindow):
             return False
 
         # Check colors
-        enabled_colors = sum(1 for color_config in config.config['colors'].values()
-                             if color_config.get('enabled', True))
-        if enabled_colors < 2:
+        if self._enabled_color_count < 2:
             QMessageBox.critical(self, "Color Setup Required",
                                  "❌ Need at least 2 line colors enabled!\n\n"
                                  "Go to 'Line Colors' tab and enable both lines.")
@@ -1236,17 +1740,50 @@ class ZigZagDetectorApp(QMainWindow):
 
         return True
 
+    def refresh_detection_settings(self, *_):
+        """Hand the running worker a fresh detection settings snapshot"""
+        if self.detection_worker:
+            self.detection_worker.settings = config.detection_settings()
+            # Re-run the next frame even if unchanged so the new settings apply
+            self.detection_worker.last_signature = None
+
+    def recount_enabled_colors(self, *_):
+        """Refresh the cached number of enabled line colors"""
+        self._enabled_color_count = sum(1 for color_config in config.config['colors'].values()
+                                        if color_config.get('enabled', True))
+
     # Signal handlers
-    def on_image_ready(self, image):
-        self.image_display.update_image(image, self.detected_lines, self.detected_crossovers)
+    def on_image_ready(self):
+        result = self.sender().take_display_frame()
+        if result is None:
+            return
+
+        if result.preview is not None:
+            self.image_display.show_preview(result.preview)
+        self.on_lines_detected(result.lines)
+        self.on_status_update(result.status)
+
+    def on_preview_resized(self, size):
+        if self.detection_worker:
+            self.detection_worker.preview_size = size
+
+    def on_preview_visibility_changed(self, visible):
+        if self.detection_worker:
+            self.detection_worker.preview_visible = visible
+            if visible:
+                # Re-run the next frame even if unchanged so the preview catches up
+                self.detection_worker.last_signature = None
 
     def on_lines_detected(self, lines):
         self.detected_lines = lines
         self.simple_lines_label.setText(f"Lines Found: {len(lines)}")
 
     def on_crossover_detected(self, crossover):
-        self.detected_crossovers.append(crossover)
-        total = len(self.detected_crossovers)
+        idx = self._cx_head % self.CROSSOVER_RING_SIZE
+        self._cx_ts[idx] = crossover.timestamp
+        self._cx_head += 1
+
+        total = self._cx_head
         self.simple_crossovers_label.setText(f"Crossovers Found: {total}")
 
         # Log with emoji
@@ -1256,57 +1793,132 @@ class ZigZagDetectorApp(QMainWindow):
         self.log_message(f"❌ Error: {error_msg}")
 
     def on_status_update(self, status_msg):
-        self.statusBar().showMessage(status_msg)
+        # Every frame result carries the status; repaint only when it changed
+        if status_msg != self.statusBar().currentMessage():
+            self.statusBar().showMessage(status_msg)
 
     # Settings change handlers
     def on_fps_changed(self, value):
         fps = value / 10.0
         self.fps_label.setText(f"{fps:.1f}")
-        config.set('capture', 'fps', fps)
+        self.settings_committer.schedule(('capture', 'fps'), lambda: self.apply_fps(fps))
+
+    def on_fast_capture_changed(self, enabled):
+        config.set('capture', 'fast_capture', enabled)
+        self.window_capture.set_fast_capture(enabled, explicit=True)
+
+    def on_preview_color_changed(self, enabled):
+        config.set('gui', 'preview_color', enabled)
+        if self.detection_worker:
+            self.detection_worker.preview_color = enabled
+            self.detection_worker.last_signature = None
 
-        # Update capture timer if running
-        if self.capture_timer.isActive():
-            self.capture_timer.setInterval(int(1000 / max(fps, 0.1)))
+    @staticmethod
+    def capture_interval_ms(fps):
+        """Capture timer period for fps, rounded to the nearest millisecond"""
+        return max(round(1000 / max(fps, 0.1)), 1)
 
-    def on_min_length_changed(self, value):
-        self.min_length_label.setText(str(value))
-        config.set('detection', 'min_line_length', value)
+    def apply_fps(self, fps):
+        config.set('capture', 'fps', fps)
 
-    def on_confidence_changed(self, value):
-        self.confidence_label.setText(f"{value}%")
-        config.set('detection', 'confidence_threshold', value / 100.0)
+        # Update capture timer if running. setInterval restarts an active
+        # timer, so leave it alone when the rounded period is unchanged.
+        interval = self.capture_interval_ms(fps)
+        if self.capture_timer.isActive() and self.capture_timer.interval() != interval:
+            self.capture_timer.setInterval(interval)
 
-    def on_debounce_changed(self, value):
-        self.debounce_label.setText(str(value))
-        config.set('detection', 'debounce_seconds', value)
+    def detection_slider_handler(self, label, key, text=str, scale=1):
+        """Build a valueChanged slot that shows one detection setting and commits it"""
+        def on_changed(value):
+            label.setText(text(value))
+            setting = value / scale if scale != 1 else value
+            self.settings_committer.schedule(('detection', key), partial(config.set, 'detection', key, setting))
+        return on_changed
 
     # Utility methods
     def log_message(self, message):
-        """Add message to log display"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}"
-        self.log_text.append(log_entry)
-
-        # Keep only last 500 lines
-        if self.log_text.document().blockCount() > 500:
-            cursor = self.log_text.textCursor()
-            cursor.movePosition(QTextCursor.Start)
-            cursor.movePosition(QTextCursor.Down, QTextCursor.KeepAnchor, 50)
-            cursor.removeSelectedText()
+        """Queue message for the log display"""
+        # Format the timestamp once per second; bursts share the cached string
+        second = int(time.time())
+        if second != self._log_stamp[0]:
+            self._log_stamp = (second, time.strftime("[%H:%M:%S]", time.localtime(second)))
+        self._log_queue.append(f"{self._log_stamp[1]} {message}")
+
+    def flush_log(self):
+        """Insert queued log lines into the log display in one batch
+
+        Lines stay queued while the Logs tab is not showing; the queue keeps
+        only the newest MAX_LOG_LINES, which is all the display would keep.
+        """
+        if not self._log_queue or self.log_text is None:
+            return
+        if self.tabs.currentIndex() != self.logs_tab_index:
+            return
+
+        batch = "\n".join(self._log_queue)
+        self._log_queue.clear()
+        self.log_text.appendPlainText(batch)
+
+    def crossover_statistics(self):
+        """Session crossover statistics from the ring buffer"""
+        now = time.time()
+        if self._stats_cache is not None:
+            head, valid_until, stats = self._stats_cache
+            if head == self._cx_head and now < valid_until:
+                return stats
+
+        count = min(self._cx_head, self.CROSSOVER_RING_SIZE)
+
+        # Timestamps are written in order, so the ring is two sorted runs:
+        # [cursor:] holds the older entries once it has wrapped, [:cursor] the newer
+        cursor = self._cx_head % self.CROSSOVER_RING_SIZE
+        if self._cx_head <= self.CROSSOVER_RING_SIZE:
+            runs = (self._cx_ts[:count],)
+        else:
+            runs = (self._cx_ts[cursor:], self._cx_ts[:cursor])
+
+        cutoff = now - 3600
+        last_hour = 0
+        valid_until = float('inf')
+        for run in runs:
+            start = int(np.searchsorted(run, cutoff, side='right'))
+            last_hour += len(run) - start
+            # The oldest entry still in the window is the next to age out
+            if start < len(run) and valid_until == float('inf'):
+                valid_until = float(run[start]) + 3600
+
+        stats = {
+            'total': self._cx_head,
+            'last_hour': last_hour
+        }
+        self._stats_cache = (self._cx_head, valid_until, stats)
+        return stats
+
+    def show_value(self, label, value, format_text):
+        """Set label text from value, skipping formatting when value is unchanged"""
+        if self._last_shown.get(label) == value:
+            return
+        self._last_shown[label] = value
+        label.setText(format_text(value))
 
     def update_status(self):
         """Update status display"""
         if self.is_detecting:
-            uptime_seconds = int(time.time() - self.start_time)
-            hours = uptime_seconds // 3600
-            minutes = (uptime_seconds % 3600) // 60
-            self.uptime_label.setText(f"Running: {hours:02d}:{minutes:02d}")
+            hours, seconds = divmod(int(time.monotonic() - self.start_time), 3600)
+            minutes = seconds // 60
+            self.show_value(self.uptime_label, (hours, minutes),
+                            lambda hm: f"Running: {hm[0]:02d}:{hm[1]:02d}")
         else:
-            self.uptime_label.setText("Not Running")
+            self.show_value(self.uptime_label, None, lambda _: "Not Running")
+
+        stats = self.crossover_statistics()
+        self.show_value(self.stats_label, (stats['total'], stats['last_hour']),
+                        lambda counts: f"Crossovers: {counts[0]} (last hour: {counts[1]})")
 
     def refresh_window_list(self):
         """Refresh window list"""
         windows = self.window_capture.find_windows()
+        self.listed_windows = windows
         self.window_list.clear()
         for window in windows:
             size_text = f"{window.rect[2] - window.rect[0]}x{window.rect[3] - window.rect[1]}"
@@ -1315,12 +1927,12 @@ class ZigZagDetectorApp(QMainWindow):
     def select_window_from_list(self):
         """Select window from list"""
         current_row = self.window_list.currentRow()
-        if current_row >= 0:
-            windows = self.window_capture.find_windows()
-            if current_row < len(windows):
-                selected_window = windows[current_row]
-                self.window_capture.set_target_window(selected_window)
-                self.window_status_label.setText(f"✅ Selected: {selected_window.title}")
+        # Resolve the row against the list as shown rather than enumerating
+        # windows again, which may also have changed order since
+        if 0 <= current_row < len(self.listed_windows):
+            selected_window = self.listed_windows[current_row]
+            self.window_capture.set_target_window(selected_window)
+            self.window_status_label.setText(f"✅ Selected: {selected_window.title}")
 
     def apply_manual_region(self):
         """Apply manual region"""
@@ -1338,7 +1950,16 @@ class ZigZagDetectorApp(QMainWindow):
         config.set('alerts', 'telegram_token', self.token_input.text())
         config.set('alerts', 'telegram_chat_id', self.chat_id_input.text())
 
-        success, message = self.alert_manager.telegram.test_connection()
+        # The test is a network round-trip of up to 10s; keep the GUI responsive
+        self.telegram_test_btn.setEnabled(False)
+        self.telegram_test_btn.setText("⏳ Testing Telegram Connection...")
+        self.telegram_tester = TelegramTester(self.alert_manager.telegram)
+        self.telegram_tester.result_ready.connect(self.on_telegram_tested)
+        self.telegram_tester.start()
+
+    def on_telegram_tested(self, success, message):
+        self.telegram_test_btn.setText("🔗 Test Telegram Connection")
+        self.telegram_test_btn.setEnabled(True)
         if success:
             QMessageBox.information(self, "Telegram Test", f"✅ {message}")
             self.log_message(f"✅ Telegram: {message}")
@@ -1349,13 +1970,16 @@ class ZigZagDetectorApp(QMainWindow):
     def save_alert_settings(self):
         """Save alert settings"""
         try:
-            config.set('alerts', 'telegram_enabled', self.telegram_enabled.isChecked())
-            config.set('alerts', 'telegram_token', self.token_input.text())
-            config.set('alerts', 'telegram_chat_id', self.chat_id_input.text())
-            config.set('alerts', 'sound_enabled', self.sound_enabled.isChecked())
-            config.set('alerts', 'log_file_enabled', self.log_enabled.isChecked())
-
-            config.save_config()
+            config.update_section('alerts', {
+                'telegram_enabled': self.telegram_enabled.isChecked(),
+                'telegram_token': self.token_input.text(),
+                'telegram_chat_id': self.chat_id_input.text(),
+                'sound_enabled': self.sound_enabled.isChecked(),
+                'log_file_enabled': self.log_enabled.isChecked()
+            })
+
+            self.settings_committer.flush()
+            self.config_writer.request_save()
             QMessageBox.information(self, "Settings Saved", "✅ Alert settings saved!")
             self.log_message("💾 Alert settings saved")
 
@@ -1364,6 +1988,7 @@ class ZigZagDetectorApp(QMainWindow):
 
     def clear_log(self):
         """Clear log"""
+        self._log_queue.clear()
         self.log_text.clear()
         self.log_message("📝 Log cleared")
 
@@ -1375,19 +2000,50 @@ class ZigZagDetectorApp(QMainWindow):
         )
         if filename:
             try:
-                with open(filename, 'w') as f:
-                    f.write(self.log_text.toPlainText())
+                self.flush_log()
+                # Stream the document block by block instead of building one
+                # string of the whole log
+                with open(filename, 'w', encoding='utf-8', buffering=131072) as f:
+                    block = self.log_text.document().firstBlock()
+                    while block.isValid():
+                        f.write(block.text())
+                        f.write('\n')
+                        block = block.next()
                 QMessageBox.information(self, "Log Saved", f"✅ Log saved to:\n{filename}")
             except Exception as e:
                 QMessageBox.critical(self, "Save Error", f"❌ Failed to save: {e}")
 
+    def changeEvent(self, event):
+        """Pause display-only timers while the window is minimized"""
+        super().changeEvent(event)
+        if event.type() != QEvent.WindowStateChange:
+            return
+
+        if self.isMinimized():
+            # Nothing on screen to update; the log queue is bounded meanwhile
+            self.status_timer.stop()
+            self.log_flush_timer.stop()
+        elif not self.status_timer.isActive():
+            self.update_status()
+            self.flush_log()
+            self.status_timer.start()
+            self.log_flush_timer.start()
+
     def closeEvent(self, event):
         """Handle app closing"""
         try:
+            # Queue the final save first so the file is written while the
+            # worker threads wind down, instead of after them
+            self.settings_committer.flush()
+            self.config_writer.request_save()
+            self.config_writer.stop()
+
             if self.is_detecting:
                 self.stop_detection()
             self.alert_manager.telegram.stop_worker()
-            config.save_config()
+            if self.telegram_tester is not None:
+                self.telegram_tester.wait()
+            self.config_writer.wait()
             self.log_message("👋 App shutting down...")
             event.accept()
         except Exception as e:
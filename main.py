@@ -9,7 +9,6 @@ import os
 import logging
 from pathlib import Path
 
-from gui.main_window import ZigZagDetectorApp, create_app
 from config.settings import setup_logging
 
 
@@ -19,6 +18,10 @@ def main():
         # Setup logging
         setup_logging()
 
+        # The GUI pulls in PySide6, OpenCV and the detectors; import it once
+        # logging is up so a missing dependency is reported with the hint below
+        from gui.main_window import ZigZagDetectorApp, create_app
+
         # Create QApplication
         app = create_app()
 